@@ -0,0 +1,17 @@
+import uvicorn
+
+from app.settings import settings
+
+if __name__ == "__main__":
+    # uvloop and httptools come with uvicorn[standard] (via fastapi[standard]);
+    # name them explicitly so a missing extra fails loudly instead of silently
+    # falling back to the pure-Python asyncio loop and h11 parser
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        loop="uvloop",
+        http="httptools",
+        log_config="logging.yaml",
+    )
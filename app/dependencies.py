@@ -1,7 +1,9 @@
 import logging
-from typing import Any, Generator
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator
 
-from fastapi import HTTPException
+from fastapi import FastAPI
 from podman import PodmanClient
 from podman.errors import APIError
 
@@ -9,22 +11,41 @@ from app.settings import settings
 
 logger = logging.getLogger(__name__)
 
+_SOCKET = settings.podman_socket
 
-def get_podman_client() -> Generator[PodmanClient, Any, None]:
+
+@lru_cache(maxsize=1)
+def _podman_client() -> PodmanClient:
+    return PodmanClient(
+        base_url=_SOCKET,
+        num_pools=settings.podman_num_pools,
+        max_pool_size=settings.podman_max_pool_size,
+    )
+
+
+async def get_podman_client() -> PodmanClient:
     """
     FastAPI dependency that provides a Podman client instance.
 
+    The client is created once and shared by all requests, and keeps a pool
+    of keep-alive connections to the podman socket, so connections are reused
+    instead of being re-established per call. Being async, it is resolved on
+    the event loop rather than sent to the threadpool for every request.
+
     Returns:
         PodmanClient: Instance of a Podman client for container management
     """
-    with PodmanClient(base_url=settings.podman_socket) as client:
-        try:
-            client.ping()
-        except APIError:
-            logger.exception("Cannot connect to podman socket")
-            raise HTTPException(
-                status_code=503,
-                detail=f"Cannot connect to podman socket at {settings.podman_socket}",
-            )
-        else:
-            yield client
+    return _podman_client()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Check the podman socket on startup and close the shared client on shutdown."""
+    client = _podman_client()
+    try:
+        client.ping()
+    except APIError:
+        logger.exception("Cannot connect to podman socket at %s", _SOCKET)
+    yield
+    client.close()
+    _podman_client.cache_clear()
@@ -0,0 +1,81 @@
+import functools
+import logging
+from typing import Any, Callable, Coroutine, ParamSpec, TypeVar
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from podman.errors import APIError, ImageNotFound, NotFound
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+def map_podman_errors(
+    error: str, not_found: str = "Not found"
+) -> Callable[
+    [Callable[P, Coroutine[Any, Any, T]]], Callable[P, Coroutine[Any, Any, T]]
+]:
+    """
+    Translate podman errors raised by an endpoint into HTTPExceptions.
+
+    NotFound and ImageNotFound become 404 with `not_found` formatted from the
+    endpoint's arguments, e.g. "Image {image_name} not found". A 409 from
+    podman is passed through with its explanation and any other APIError
+    becomes a 500 with `error` as detail. Anything else, including
+    HTTPExceptions raised by the endpoint itself, propagates unchanged.
+    """
+
+    def decorator(
+        endpoint: Callable[P, Coroutine[Any, Any, T]],
+    ) -> Callable[P, Coroutine[Any, Any, T]]:
+        @functools.wraps(endpoint)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            try:
+                return await endpoint(*args, **kwargs)
+            except HTTPException:
+                raise
+            except (NotFound, ImageNotFound):
+                raise HTTPException(status_code=404, detail=not_found.format(**kwargs))
+            except APIError as e:
+                if e.status_code == 409:
+                    raise HTTPException(status_code=409, detail=e.explanation)
+                logger.exception(error)
+                raise HTTPException(status_code=500, detail=error)
+
+        return wrapper
+
+    return decorator
+
+
+async def http_exception_handler(
+    request: Request, exc: StarletteHTTPException
+) -> Response:
+    """Render HTTPExceptions with orjson instead of starlette's stdlib JSON."""
+    if exc.status_code in (204, 304):
+        return Response(status_code=exc.status_code, headers=exc.headers)
+    return ORJSONResponse(
+        {"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers
+    )
+
+
+async def podman_error_handler(request: Request, exc: APIError) -> ORJSONResponse:
+    """Catch podman APIErrors that escaped an endpoint without being mapped."""
+    if isinstance(exc, (NotFound, ImageNotFound)):
+        return ORJSONResponse({"detail": "Not found"}, status_code=404)
+    if exc.status_code == 409:
+        return ORJSONResponse({"detail": exc.explanation}, status_code=409)
+    logger.error("Podman API error", exc_info=exc)
+    return ORJSONResponse({"detail": "Podman API error"}, status_code=500)
+
+
+async def unexpected_error_handler(request: Request, exc: Exception) -> ORJSONResponse:
+    """
+    Answer any exception no endpoint handled with a generic 500.
+
+    Nothing is logged here: ServerErrorMiddleware re-raises the exception after
+    this response is sent, and the server logs its traceback then.
+    """
+    return ORJSONResponse({"detail": "Unexpected error"}, status_code=500)
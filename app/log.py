@@ -0,0 +1,61 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, TextIO
+
+import orjson
+
+
+class QueueStreamHandler(QueueHandler):
+    """
+    Stream handler that formats and writes records on a background thread.
+
+    Logging calls only put the record on a queue; a QueueListener thread hands
+    it to a regular StreamHandler, so formatting and stream I/O stay off the
+    request path. Drop-in replacement for logging.StreamHandler in logging.yaml.
+    """
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        super().__init__(queue.SimpleQueue())
+        self.target = logging.StreamHandler(stream)
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        self._listening = True
+
+    def setFormatter(self, fmt: logging.Formatter | None) -> None:
+        # Records are formatted by the target handler on the listener thread
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records never leave the process, so they don't need pre-formatting
+        return record
+
+    def close(self) -> None:
+        if self._listening:
+            self.listener.stop()
+            self._listening = False
+        self.target.close()
+        super().close()
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Render each record as a single-line JSON object encoded with orjson.
+
+    Emits the raw epoch timestamp instead of a strftime-formatted asctime.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": record.created,
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return orjson.dumps(payload).decode()
@@ -1,12 +1,32 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from podman.errors import APIError
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app.dependencies import lifespan
+from app.errors import (
+    http_exception_handler,
+    podman_error_handler,
+    unexpected_error_handler,
+)
+from app.middleware import StreamSafeGZipMiddleware
 from app.routers import containers, images, info, login, logs, pods, volumes
 
 app = FastAPI(
     title="Podman API",
     description="REST API for Podman container management",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Image, pod and container lists are repetitive JSON that shrinks several-fold;
+# streamed logs, pull progress and run output are left uncompressed
+app.add_middleware(StreamSafeGZipMiddleware, minimum_size=1024)
+
+app.exception_handler(StarletteHTTPException)(http_exception_handler)
+app.exception_handler(APIError)(podman_error_handler)
+app.exception_handler(Exception)(unexpected_error_handler)
+
 app.include_router(router=images.router, prefix="/api")
 app.include_router(router=login.router, prefix="/api")
 app.include_router(router=containers.router, prefix="/api")
@@ -0,0 +1,57 @@
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class StreamSafeGZipMiddleware:
+    """
+    Gzip responses that are sent whole, and pass streamed ones through.
+
+    Starlette's GZipMiddleware compresses streams too, and its gzip buffer holds
+    log lines, pull progress and run output back until it fills. Here only a
+    response whose body arrives in a single message is compressed, so every
+    StreamingResponse goes out chunk by chunk as it is produced.
+    """
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get(
+            "Accept-Encoding", ""
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # The start message is held back until the first body message shows
+        # whether the response is whole or streamed
+        start: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is not None:
+                initial, start = start, None
+                headers = MutableHeaders(raw=initial["headers"])
+                body = message.get("body", b"")
+                if (
+                    message["type"] == "http.response.body"
+                    and not message.get("more_body", False)
+                    and len(body) >= self.minimum_size
+                    and "content-encoding" not in headers
+                ):
+                    message["body"] = gzip.compress(body, self.compresslevel)
+                    headers["Content-Encoding"] = "gzip"
+                    headers["Content-Length"] = str(len(message["body"]))
+                    headers.add_vary_header("Accept-Encoding")
+                await send(initial)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
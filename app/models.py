@@ -0,0 +1,110 @@
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class RunContainerRequest(BaseModel):
+    """Request body for running a container from an image."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    image_name: str = Field(description="Image name to run")
+    container_name: str | None = Field(None, description="Name for the container")
+    command: str | list[str] | None = Field(
+        None, description="Command to run in the container"
+    )
+    environment: dict[str, str] | None = Field(
+        None, description="Environment variables"
+    )
+    volumes: dict[str, dict[str, str]] | None = Field(
+        None, description="Volumes to mount"
+    )
+    detach: bool = Field(
+        False, description="Run container in background and return container object"
+    )
+    remove: bool = Field(False, description="Remove container when it exits")
+    stream: bool = Field(
+        False,
+        description="Stream the output of a non-detached container as plain text",
+    )
+    auto_remove: bool = Field(
+        False, description="Automatically remove the container when it exits"
+    )
+    privileged: bool = Field(
+        False, description="Give extended privileges to this container"
+    )
+    network: str | None = Field(None, description="Connect the container to a network")
+    ports: dict[str, int | str | list[str]] | None = Field(
+        None, description="Port mappings"
+    )
+    user: str | None = Field(None, description="Username or UID to run the container")
+    working_dir: str | None = Field(
+        None, description="Working directory inside the container"
+    )
+    entrypoint: str | list[str] | None = Field(
+        None, description="Overwrite the default ENTRYPOINT of the image"
+    )
+    cap_add: list[str] | None = Field(None, description="Add Linux capabilities")
+    cap_drop: list[str] | None = Field(None, description="Drop Linux capabilities")
+    device_cgroup_rules: list[str] | None = Field(
+        None, description="Add rules to the device cgroup"
+    )
+    devices: list[str] | None = Field(
+        None, description="Expose host devices to the container"
+    )
+    dns: list[str] | None = Field(None, description="Set custom DNS servers")
+    dns_search: list[str] | None = Field(
+        None, description="Set custom DNS search domains"
+    )
+    extra_hosts: dict[str, str] | None = Field(
+        None, description="Add hostname mappings"
+    )
+    group_add: list[str] | None = Field(
+        None, description="Add additional groups to join"
+    )
+    init: bool | None = Field(None, description="Run an init inside the container")
+    ipc_mode: str | None = Field(None, description="IPC mode to use")
+    isolation: str | None = Field(None, description="Container isolation technology")
+    labels: dict[str, str] | None = Field(None, description="Container labels")
+    log_driver: str | None = Field(None, description="Logging driver for the container")
+    log_options: dict[str, str] | None = Field(None, description="Log driver options")
+    mac_address: str | None = Field(None, description="Container MAC address")
+    mem_limit: str | None = Field(None, description="Memory limit")
+    mem_reservation: str | None = Field(None, description="Memory soft limit")
+    memswap_limit: str | None = Field(
+        None, description="Swap limit equal to memory plus swap"
+    )
+    oom_kill_disable: bool | None = Field(None, description="Disable OOM Killer")
+    oom_score_adj: int | None = Field(None, description="Tune host's OOM preferences")
+    pid_mode: str | None = Field(None, description="PID mode to use")
+    pids_limit: int | None = Field(None, description="Tune container pids limit")
+    platform: str | None = Field(
+        None, description="Platform in the format os[/arch[/variant]]"
+    )
+    restart_policy: dict[str, Any] | None = Field(
+        None, description="Restart policy to apply when a container exits"
+    )
+    security_opt: list[str] | None = Field(None, description="Security options")
+    shm_size: str | None = Field(None, description="Size of /dev/shm")
+    stdin_open: bool | None = Field(
+        None, description="Keep STDIN open even if not attached"
+    )
+    stop_signal: str | None = Field(None, description="Signal to stop a container")
+    stop_timeout: int | None = Field(
+        None, description="Timeout (in seconds) to stop a container"
+    )
+    storage_opt: dict[str, str] | None = Field(
+        None, description="Storage driver options"
+    )
+    sysctls: dict[str, str] | None = Field(None, description="Sysctls options")
+    tmpfs: dict[str, str] | None = Field(None, description="Mount a tmpfs directory")
+    tty: bool | None = Field(None, description="Allocate a pseudo-TTY")
+    ulimits: list[dict[str, Any]] | None = Field(None, description="Ulimit options")
+    userns_mode: str | None = Field(None, description="User namespace to use")
+    uts_mode: str | None = Field(None, description="UTS mode to use")
+    volume_driver: str | None = Field(
+        None, description="Optional volume driver for the container"
+    )
+    volumes_from: list[str] | None = Field(
+        None, description="Mount volumes from the specified container(s)"
+    )
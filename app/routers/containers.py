@@ -1,29 +1,102 @@
 import logging
-from enum import Enum
-from typing import Annotated, Any
+from collections.abc import Iterable, Iterator
+from typing import Annotated, Any, Literal, cast, get_args
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Query
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from podman import PodmanClient
-from podman.errors import APIError, ContainerError, ImageNotFound, NotFound
+from podman.domain.containers import Container
+from podman.errors import ContainerError, ImageNotFound
 
 from app.dependencies import get_podman_client
+from app.errors import map_podman_errors
+from app.models import RunContainerRequest
+from app.settings import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/containers", tags=["containers"])
 
 
-class Status(str, Enum):
-    created = "created"
-    initialized = "initialized"
-    running = "running"
-    paused = "paused"
-    exited = "exited"
-    unknown = "unknown"
+Status = Literal["created", "initialized", "running", "paused", "exited", "unknown"]
 
+# Pre-rendered list_containers filter for each status
+_STATUS_FILTER = {status: f"status={status}" for status in get_args(Status)}
 
-@router.get("")
-def list_containers(
+
+# containers.run() keyword arguments that are only forwarded when truthy
+_RUN_TRUTHY_PARAMS = (
+    "name",
+    "environment",
+    "volumes",
+    "detach",
+    "stream",
+    "auto_remove",
+    "privileged",
+    "network",
+    "ports",
+    "user",
+    "working_dir",
+    "entrypoint",
+    "cap_add",
+    "cap_drop",
+    "device_cgroup_rules",
+    "devices",
+    "dns",
+    "dns_search",
+    "extra_hosts",
+    "group_add",
+    "ipc_mode",
+    "isolation",
+    "labels",
+    "log_driver",
+    "log_options",
+    "mac_address",
+    "mem_limit",
+    "mem_reservation",
+    "memswap_limit",
+    "pid_mode",
+    "platform",
+    "restart_policy",
+    "security_opt",
+    "shm_size",
+    "stop_signal",
+    "storage_opt",
+    "sysctls",
+    "tmpfs",
+    "ulimits",
+    "userns_mode",
+    "uts_mode",
+    "volume_driver",
+    "volumes_from",
+)
+# containers.run() keyword arguments that are meaningful even when falsy,
+# e.g. init=False or oom_score_adj=0, so only None is skipped
+_RUN_NOT_NONE_PARAMS = (
+    "init",
+    "oom_kill_disable",
+    "oom_score_adj",
+    "pids_limit",
+    "stdin_open",
+    "stop_timeout",
+    "tty",
+)
+
+# Recent list_containers results keyed on the query, so dashboards polling
+# the endpoint are served from memory instead of hitting podman every time.
+# Only touched from the event loop, so it needs no lock. It is per process:
+# a run or delete clears only the cache of the worker that handled it.
+_list_cache: TTLCache[tuple[Any, ...], bytes] = TTLCache(
+    maxsize=128, ttl=settings.containers_cache_ttl
+)
+
+
+@router.get("", response_model=list[dict[str, Any]])
+@map_podman_errors("Error listing containers")
+async def list_containers(
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
     all_: Annotated[
         bool, Query(alias="all", description="If False, only show running containers")
@@ -44,149 +117,72 @@ def list_containers(
         int | None, Query(description="Show only containers with this exit code")
     ] = None,
     id_: Annotated[
-        str | None, Query(alias="id", description="Show only container with this id")
+        list[str] | None,
+        Query(
+            alias="id",
+            description="Show only containers with these ids; repeat to fetch several",
+        ),
     ] = None,
     name: Annotated[
         str | None, Query(description="Show only container with this name")
     ] = None,
-) -> list[dict[str, Any]]:
-    """List containers."""
-    filters: dict[str, Any] = {}
-
-    if status is not None:
-        filters["status"] = status.value
-    if exited is not None:
-        filters["exited"] = exited
-    if id_ is not None:
-        filters["id"] = id_
-    if name is not None:
-        filters["name"] = name
+) -> Response:
+    """
+    List containers.
 
-    try:
-        containers = podman_client.containers.list(
+    Several containers can be fetched in a single podman round-trip by
+    repeating the id parameter, e.g. `?id=abc&id=def`, instead of inspecting
+    them one by one.
+    """
+    # podman's "key=value" filter form allows repeating a key, which the dict
+    # form does not, so all requested ids go out in one list call. since and
+    # before travel as filters too: containers.list() writes those kwargs into
+    # filters as if it were a dict, which fails on the list form
+    filters = [_STATUS_FILTER[status]] if status is not None else []
+    filters += [
+        f"{key}={value}"
+        for key, values in (
+            ("since", [since] if since is not None else []),
+            ("before", [before] if before is not None else []),
+            ("exited", [exited] if exited is not None else []),
+            ("id", id_ or []),
+            ("name", [name] if name is not None else []),
+        )
+        for value in values
+    ]
+
+    # since and before are part of filters, so the key covers them
+    key = (all_, limit, tuple(filters))
+    body = _list_cache.get(key)
+    if body is None:
+        containers = await run_in_threadpool(
+            podman_client.containers.list,
             all=all_,
-            since=since,
-            before=before,
             limit=limit,
             filters=filters,
         )
-    except APIError:
-        logger.exception("Error listing containers")
-        raise HTTPException(status_code=500, detail="Error listing containers")
+        # Podman attrs are already JSON-safe; serialise once and cache the bytes
+        body = _list_cache[key] = orjson.dumps(
+            [container.attrs for container in containers]
+        )
 
-    results = []
-    for container in containers:
-        attrs = container.attrs
-        results.append(attrs)
-    return results
+    return Response(content=body, media_type="application/json")
 
 
-@router.post("")
-def run_container(
+@router.post("", response_model=dict[str, Any])
+@map_podman_errors("Error running container")
+async def run_container(
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
-    image_name: str = Body(..., description="Image name to run"),
-    container_name: str | None = Body(None, description="Name for the container"),
-    command: str | list[str] | None = Body(
-        None, description="Command to run in the container"
-    ),
-    environment: dict[str, str] | None = Body(
-        None, description="Environment variables"
-    ),
-    volumes: dict[str, dict[str, str]] | None = Body(
-        None, description="Volumes to mount"
-    ),
-    detach: bool = Body(
-        False, description="Run container in background and return container object"
-    ),
-    remove: bool = Body(False, description="Remove container when it exits"),
-    auto_remove: bool = Body(
-        False, description="Automatically remove the container when it exits"
-    ),
-    privileged: bool = Body(
-        False, description="Give extended privileges to this container"
-    ),
-    network: str | None = Body(None, description="Connect the container to a network"),
-    ports: dict[str, int | str | list[str]] | None = Body(
-        None, description="Port mappings"
-    ),
-    user: str | None = Body(None, description="Username or UID to run the container"),
-    working_dir: str | None = Body(
-        None, description="Working directory inside the container"
-    ),
-    entrypoint: str | list[str] | None = Body(
-        None, description="Overwrite the default ENTRYPOINT of the image"
-    ),
-    cap_add: list[str] | None = Body(None, description="Add Linux capabilities"),
-    cap_drop: list[str] | None = Body(None, description="Drop Linux capabilities"),
-    device_cgroup_rules: list[str] | None = Body(
-        None, description="Add rules to the device cgroup"
-    ),
-    devices: list[str] | None = Body(
-        None, description="Expose host devices to the container"
-    ),
-    dns: list[str] | None = Body(None, description="Set custom DNS servers"),
-    dns_search: list[str] | None = Body(
-        None, description="Set custom DNS search domains"
-    ),
-    extra_hosts: dict[str, str] | None = Body(
-        None, description="Add hostname mappings"
-    ),
-    group_add: list[str] | None = Body(
-        None, description="Add additional groups to join"
-    ),
-    init: bool | None = Body(None, description="Run an init inside the container"),
-    ipc_mode: str | None = Body(None, description="IPC mode to use"),
-    isolation: str | None = Body(None, description="Container isolation technology"),
-    labels: dict[str, str] | None = Body(None, description="Container labels"),
-    log_driver: str | None = Body(None, description="Logging driver for the container"),
-    log_options: dict[str, str] | None = Body(None, description="Log driver options"),
-    mac_address: str | None = Body(None, description="Container MAC address"),
-    mem_limit: str | None = Body(None, description="Memory limit"),
-    mem_reservation: str | None = Body(None, description="Memory soft limit"),
-    memswap_limit: str | None = Body(
-        None, description="Swap limit equal to memory plus swap"
-    ),
-    oom_kill_disable: bool | None = Body(None, description="Disable OOM Killer"),
-    oom_score_adj: int | None = Body(None, description="Tune host's OOM preferences"),
-    pid_mode: str | None = Body(None, description="PID mode to use"),
-    pids_limit: int | None = Body(None, description="Tune container pids limit"),
-    platform: str | None = Body(
-        None, description="Platform in the format os[/arch[/variant]]"
-    ),
-    restart_policy: dict[str, Any] | None = Body(
-        None, description="Restart policy to apply when a container exits"
-    ),
-    security_opt: list[str] | None = Body(None, description="Security options"),
-    shm_size: str | None = Body(None, description="Size of /dev/shm"),
-    stdin_open: bool | None = Body(
-        None, description="Keep STDIN open even if not attached"
-    ),
-    stop_signal: str | None = Body(None, description="Signal to stop a container"),
-    stop_timeout: int | None = Body(
-        None, description="Timeout (in seconds) to stop a container"
-    ),
-    storage_opt: dict[str, str] | None = Body(
-        None, description="Storage driver options"
-    ),
-    sysctls: dict[str, str] | None = Body(None, description="Sysctls options"),
-    tmpfs: dict[str, str] | None = Body(None, description="Mount a tmpfs directory"),
-    tty: bool | None = Body(None, description="Allocate a pseudo-TTY"),
-    ulimits: list[dict[str, Any]] | None = Body(None, description="Ulimit options"),
-    userns_mode: str | None = Body(None, description="User namespace to use"),
-    uts_mode: str | None = Body(None, description="UTS mode to use"),
-    volume_driver: str | None = Body(
-        None, description="Optional volume driver for the container"
-    ),
-    volumes_from: list[str] | None = Body(
-        None, description="Mount volumes from the specified container(s)"
-    ),
-) -> dict[str, Any]:
+    body: RunContainerRequest,
+) -> dict[str, Any] | StreamingResponse:
     """
     Run a container from an image.
 
     This endpoint creates and starts a container from the specified image.
     It can run the container in the background (detach=True) or wait for it to finish.
     The container can be automatically removed when it exits (remove=True).
+    With stream=True the output of a non-detached container is streamed to the client
+    as plain text instead of being collected into the JSON response.
 
     Example (run nginx in the background):
     ```JSON
@@ -222,178 +218,85 @@ def run_container(
     ```
     """
     try:
-        # Prepare kwargs for the run method
-        kwargs: dict[str, Any] = {}
-
-        # Add optional parameters if provided
-        if container_name:
-            kwargs["name"] = container_name
-        if environment:
-            kwargs["environment"] = environment
-        if volumes:
-            kwargs["volumes"] = volumes
-        if detach:
-            kwargs["detach"] = detach
-        if auto_remove:
-            kwargs["auto_remove"] = auto_remove
-        if privileged:
-            kwargs["privileged"] = privileged
-        if network:
-            kwargs["network"] = network
-        if ports:
-            kwargs["ports"] = ports
-        if user:
-            kwargs["user"] = user
-        if working_dir:
-            kwargs["working_dir"] = working_dir
-        if entrypoint:
-            kwargs["entrypoint"] = entrypoint
-        if cap_add:
-            kwargs["cap_add"] = cap_add
-        if cap_drop:
-            kwargs["cap_drop"] = cap_drop
-        if device_cgroup_rules:
-            kwargs["device_cgroup_rules"] = device_cgroup_rules
-        if devices:
-            kwargs["devices"] = devices
-        if dns:
-            kwargs["dns"] = dns
-        if dns_search:
-            kwargs["dns_search"] = dns_search
-        if extra_hosts:
-            kwargs["extra_hosts"] = extra_hosts
-        if group_add:
-            kwargs["group_add"] = group_add
-        if init is not None:
-            kwargs["init"] = init
-        if ipc_mode:
-            kwargs["ipc_mode"] = ipc_mode
-        if isolation:
-            kwargs["isolation"] = isolation
-        if labels:
-            kwargs["labels"] = labels
-        if log_driver:
-            kwargs["log_driver"] = log_driver
-        if log_options:
-            kwargs["log_options"] = log_options
-        if mac_address:
-            kwargs["mac_address"] = mac_address
-        if mem_limit:
-            kwargs["mem_limit"] = mem_limit
-        if mem_reservation:
-            kwargs["mem_reservation"] = mem_reservation
-        if memswap_limit:
-            kwargs["memswap_limit"] = memswap_limit
-        if oom_kill_disable is not None:
-            kwargs["oom_kill_disable"] = oom_kill_disable
-        if oom_score_adj is not None:
-            kwargs["oom_score_adj"] = oom_score_adj
-        if pid_mode:
-            kwargs["pid_mode"] = pid_mode
-        if pids_limit is not None:
-            kwargs["pids_limit"] = pids_limit
-        if platform:
-            kwargs["platform"] = platform
-        if restart_policy:
-            kwargs["restart_policy"] = restart_policy
-        if security_opt:
-            kwargs["security_opt"] = security_opt
-        if shm_size:
-            kwargs["shm_size"] = shm_size
-        if stdin_open is not None:
-            kwargs["stdin_open"] = stdin_open
-        if stop_signal:
-            kwargs["stop_signal"] = stop_signal
-        if stop_timeout is not None:
-            kwargs["stop_timeout"] = stop_timeout
-        if storage_opt:
-            kwargs["storage_opt"] = storage_opt
-        if sysctls:
-            kwargs["sysctls"] = sysctls
-        if tmpfs:
-            kwargs["tmpfs"] = tmpfs
-        if tty is not None:
-            kwargs["tty"] = tty
-        if ulimits:
-            kwargs["ulimits"] = ulimits
-        if userns_mode:
-            kwargs["userns_mode"] = userns_mode
-        if uts_mode:
-            kwargs["uts_mode"] = uts_mode
-        if volume_driver:
-            kwargs["volume_driver"] = volume_driver
-        if volumes_from:
-            kwargs["volumes_from"] = volumes_from
+        params = body.model_dump(exclude={"image_name", "command", "remove"})
+        params["name"] = params.pop("container_name")
+        # Forward optional parameters only when they are set
+        kwargs: dict[str, Any] = {
+            key: params[key] for key in _RUN_TRUTHY_PARAMS if params[key]
+        }
+        kwargs.update(
+            (key, params[key])
+            for key in _RUN_NOT_NONE_PARAMS
+            if params[key] is not None
+        )
 
         # Run the container
-        result = podman_client.containers.run(
-            image=image_name, command=command, remove=remove, **kwargs
+        result = await run_in_threadpool(
+            podman_client.containers.run,
+            image=body.image_name,
+            command=body.command,
+            remove=body.remove,
+            **kwargs,
         )
+        _list_cache.clear()
 
         # If detach is True, result is a Container object
-        if detach:
-            # Check if result has the required attributes (id and name)
-            # This works with both real Container objects and mocks in tests
-            if hasattr(result, "id") and hasattr(result, "name"):
-                return {
-                    "status": "success",
-                    "message": f"Container started from image {image_name}",
-                    "container_id": result.id,
-                    "container_name": result.name,
-                }
-            else:
-                # This should not happen if detach=True, but handle it just in case
-                return {
-                    "status": "success",
-                    "message": f"Container started from image {image_name}",
-                }
+        if body.detach:
+            container = cast(Container, result)
+            return {
+                "status": "success",
+                "message": f"Container started from image {body.image_name}",
+                "container_id": container.id,
+                "container_name": container.name,
+            }
 
         # For non-detached containers, result is either bytes, str, or an iterator
         output: str = ""
 
-        # If result is bytes, decode it
+        # If result is bytes, decode the whole buffer once; a truncated
+        # multi-byte sequence must not turn a finished run into a 500
         if isinstance(result, bytes):
-            output = result.decode("utf-8")
+            output = result.decode("utf-8", errors="replace")
         # If result is a string, use it directly
         elif isinstance(result, str):
             output = result
-        # If result is an iterator, join the items
-        elif hasattr(result, "__iter__") and not isinstance(result, (str, bytes)):
-            # Join the iterator items into a string
-            output_parts = []
-            for item in result:
-                if isinstance(item, bytes):
-                    output_parts.append(item.decode("utf-8"))
-                else:
-                    output_parts.append(str(item))
-            output = "".join(output_parts)
+        # If result is an iterator, stream the items as they arrive
+        elif isinstance(result, Iterable):
+
+            def iter_output() -> Iterator[bytes]:
+                for item in result:
+                    yield item if isinstance(item, bytes) else str(item).encode()
+
+            return StreamingResponse(iter_output(), media_type="text/plain")
         # Fallback for any other type
         else:
             output = str(result)
 
         return {
             "status": "success",
-            "message": f"Container from image {image_name} completed",
+            "message": f"Container from image {body.image_name} completed",
             "output": output,
         }
 
     except ImageNotFound:
-        raise HTTPException(status_code=404, detail=f"Image {image_name} not found")
-    except ContainerError as e:
+        # Any other missing resource, e.g. a network, gets the generic 404
         raise HTTPException(
-            status_code=500,
-            detail=f"Container error: {str(e)}. Exit code: {e.exit_status}",
+            status_code=404, detail=f"Image {body.image_name} not found"
         )
-    except APIError as e:
+    except ContainerError as e:
+        # The container's stderr goes to the log, not into the response
+        logger.warning("Container from image %s failed: %s", body.image_name, e)
         raise HTTPException(
-            status_code=500, detail=f"Error running container: {str(e)}"
+            status_code=500, detail=f"Container error. Exit code: {e.exit_status}"
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
 @router.delete("/{container_id}", status_code=204)
-def delete_container(
+@map_podman_errors(
+    "Error deleting container. Consider using force=True.",
+    not_found="Container {container_id} not found",
+)
+async def delete_container(
     container_id: str,
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
     force: bool = Query(False, description="Force removal of a running container"),
@@ -406,21 +309,6 @@ def delete_container(
     Returns:
         HTTP 204 No Content on success.
     """
-    try:
-        container = podman_client.containers.get(container_id)
-        container.remove(force=force)
-    except NotFound:
-        raise HTTPException(
-            status_code=404, detail=f"Container {container_id} not found"
-        )
-    except APIError as e:
-        logger.exception("Error deleting container")
-        if e.status_code == 409:
-            raise HTTPException(status_code=409, detail=e.explanation)
-        raise HTTPException(
-            status_code=500,
-            detail="Error deleting container. Consider using force=True.",
-        )
-    except Exception:
-        logger.exception("Unexpected error while deleting container")
-        raise HTTPException(status_code=500, detail="Unexpected error")
+    # A single DELETE; podman answers 404 itself, so no inspect beforehand
+    await run_in_threadpool(podman_client.containers.remove, container_id, force=force)
+    _list_cache.clear()
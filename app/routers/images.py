@@ -1,40 +1,93 @@
 import logging
-from typing import Annotated, Any
-
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from collections.abc import AsyncIterator, Iterator
+from typing import Annotated, Any, cast
+
+import orjson
+from cachetools import TTLCache
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import StreamingResponse
 from podman import PodmanClient
-from podman.errors import APIError, ImageNotFound
 
 from app.dependencies import get_podman_client
+from app.errors import map_podman_errors
+from app.settings import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/images", tags=["images"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
-@router.get("")
-def get_images(
-    podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
-) -> list[dict[str, Any]]:
-    """Get a list of all images."""
-    results = []
-    for image in podman_client.images.list():
-        attrs = image.attrs
-        results.append(attrs)
-    return results
 
+# The serialised image list, so UIs polling get_images are served from memory.
+# TTLCache is not thread-safe, so it is only touched on the event loop, never
+# from threadpool code such as a sync streaming generator. It is per process:
+# a pull or delete clears only the cache of the worker that handled it.
+_images_cache: TTLCache[str, bytes] = TTLCache(maxsize=1, ttl=settings.images_cache_ttl)
 
-@router.post("/pull", status_code=status.HTTP_204_NO_CONTENT)
-def pull_image(
+
+@router.get("", response_model=list[dict[str, Any]])
+@map_podman_errors("Error listing images")
+async def get_images(
+    podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
+    """
+    Get a list of all images.
+
+    Send `Accept: application/x-ndjson` to receive one JSON object per line
+    instead of a single JSON array.
+    """
+    body = _images_cache.get("images")
+    if body is None:
+        # images.list() only wraps each entry of this response in an Image whose
+        # attrs are the entry itself, so pass podman's JSON through as-is
+        response = await run_in_threadpool(podman_client.api.get, "/images/json")
+        # images.list() also reads a 404 as "no images" rather than an error
+        if response.status_code == status.HTTP_404_NOT_FOUND:
+            body = b"[]"
+        else:
+            response.raise_for_status()
+            body = response.content
+        _images_cache["images"] = body
+    # The representation depends on Accept, so caches must key on it
+    headers = {"Vary": "Accept"}
+    if accept is not None and NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(
+            (orjson.dumps(image) + b"\n" for image in orjson.loads(body)),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers,
+        )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.post("/pull", status_code=status.HTTP_204_NO_CONTENT, response_model=None)
+@map_podman_errors("Error pulling image", not_found="Image {image_name} not found")
+async def pull_image(
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
     image_name: str = Body(..., description="Image name to pull", embed=True),
-) -> None:
+    accept: Annotated[str | None, Header()] = None,
+) -> StreamingResponse | None:
     """
     Pull an image from a registry.
 
     This endpoint pulls an image using only the image name.
     For authentication, use the /login endpoint first.
 
+    By default the response is sent once the pull has finished. Send
+    `Accept: application/x-ndjson` to instead receive podman's pull progress
+    as newline-delimited JSON while the layers arrive.
+
     Example (pull nginx from Docker Hub):
     ```JSON
     {
@@ -49,27 +102,44 @@ def pull_image(
     }
     ```
     """
-    try:
-        podman_client.images.pull(image_name)
-        logger.info("Image %s pulled successfully", image_name)
-        return None
-    except ImageNotFound:
-        logger.exception("Image not found")
-        raise HTTPException(status_code=404, detail=f"Image {image_name} not found")
-    except APIError:
-        logger.exception("Error pulling image")
-        raise HTTPException(status_code=500, detail="Error pulling image")
-    except Exception:
-        logger.exception("Unexpected error")
-        raise HTTPException(status_code=500, detail="Unexpected error")
+    if accept is not None and NDJSON_MEDIA_TYPE in accept:
+        # Registry errors are raised here, before the response starts
+        progress = cast(
+            Iterator[dict[str, Any]],
+            await run_in_threadpool(
+                podman_client.images.pull, image_name, stream=True, decode=True
+            ),
+        )
+
+        # Async, so that podman is read in the threadpool but the cache is
+        # cleared on the event loop like everywhere else
+        async def iter_progress() -> AsyncIterator[bytes]:
+            # A failed pull still ends the stream normally, with an error line
+            error = None
+            async for line in iterate_in_threadpool(progress):
+                error = error or line.get("error") or line.get("errorDetail")
+                yield orjson.dumps(line) + b"\n"
+            if error:
+                logger.error("Error while pulling image %s: %s", image_name, error)
+                return
+            _images_cache.clear()
+            logger.info("Image %s pulled successfully", image_name)
+
+        return StreamingResponse(iter_progress(), media_type=NDJSON_MEDIA_TYPE)
+
+    await run_in_threadpool(podman_client.images.pull, image_name)
+    _images_cache.clear()
+    logger.info("Image %s pulled successfully", image_name)
+    return None
 
 
 @router.delete("", status_code=204)
-def delete_image(
+@map_podman_errors("Error deleting image", not_found="Image not found")
+async def delete_image(
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
     image_id: str | None = None,
     image_name: str | None = None,
-    force: bool = False,
+    force: bool = Query(False, description="Force removal of an image in use"),
 ) -> None:
     """
     Delete an image from the local storage by its name or id.
@@ -80,42 +150,25 @@ def delete_image(
     Returns a 204 No Content status code on success.
     """
 
-    match (image_id, image_name):
-        case (None, None):
-            logger.warning("Either image_id or image_name must be provided")
-            raise HTTPException(
-                status_code=400, detail="Either image_id or image_name must be provided"
-            )
-        case (None, str()):
-            logger.info("Deleting image by name: %s", image_name)
-            identifier = image_name
-        case (str(), None):
-            logger.info("Deleting image by id: %s", image_id)
-            identifier = image_id
-        case (str(), str()):
+    if image_id is not None:
+        if image_name is not None:
             logger.warning("Either image_id or image_name must be provided, not both")
             raise HTTPException(
                 status_code=400,
                 detail="Either image_id or image_name must be provided, not both",
             )
-        case _:
-            logger.error("Unexpected error; id=%s, name=%s", image_id, image_name)
-            raise HTTPException(status_code=500, detail="Unexpected error")
-
-    try:
-        podman_client.images.remove(image=identifier, force=force)
-        logger.info("Image %s deleted successfully", identifier)
-        return None
-    except ImageNotFound:
-        logger.exception("Image not found")
-        raise HTTPException(status_code=404, detail=f"Image {image_name} not found")
-    except APIError as e:
-        if e.status_code == 409:
-            logger.exception("Image is in use by a container")
-            raise HTTPException(status_code=409, detail=e.explanation)
-        else:
-            logger.exception("Error deleting image")
-            raise HTTPException(status_code=500, detail="Error deleting image")
-    except Exception:
-        logger.exception("Unexpected error")
-        raise HTTPException(status_code=500, detail="Unexpected error")
+        logger.info("Deleting image by id: %s", image_id)
+        identifier = image_id
+    elif image_name is not None:
+        logger.info("Deleting image by name: %s", image_name)
+        identifier = image_name
+    else:
+        logger.warning("Either image_id or image_name must be provided")
+        raise HTTPException(
+            status_code=400, detail="Either image_id or image_name must be provided"
+        )
+
+    await run_in_threadpool(podman_client.images.remove, image=identifier, force=force)
+    _images_cache.clear()
+    logger.info("Image %s deleted successfully", identifier)
+    return None
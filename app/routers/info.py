@@ -1,16 +1,28 @@
 from typing import Annotated, Any
 
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from podman import PodmanClient
 
 from app.dependencies import get_podman_client
+from app.settings import settings
 
 router = APIRouter(prefix="/info", tags=["info"])
 
 
+# Host details rarely change, so monitoring polls are served from memory.
+# Only touched from the event loop, so it needs no lock.
+_info_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    maxsize=1, ttl=settings.info_cache_ttl
+)
+
+
 @router.get("")
-def get_info(
+async def get_info(
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
 ) -> dict[str, Any]:
-    info = podman_client.info()
+    info = _info_cache.get("info")
+    if info is None:
+        info = _info_cache["info"] = await run_in_threadpool(podman_client.info)
     return info
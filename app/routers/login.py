@@ -1,6 +1,7 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from podman import PodmanClient
 from podman.errors import APIError
 
@@ -10,7 +11,7 @@ router = APIRouter(prefix="/login", tags=["login"])
 
 
 @router.post("/repository")
-def login_repository(
+async def login_repository(
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
     username: str = Body(..., description="Registry username"),
     password: str = Body(..., description="Registry password"),
@@ -40,8 +41,8 @@ def login_repository(
     ```
     """
     try:
-        result = podman_client.login(
-            username=username, password=password, registry=registry
+        result = await run_in_threadpool(
+            podman_client.login, username=username, password=password, registry=registry
         )
 
         return {
@@ -51,5 +52,3 @@ def login_repository(
         }
     except APIError:
         raise HTTPException(status_code=401, detail="Authentication failed")
-    except Exception:
-        raise HTTPException(status_code=500, detail="Unexpected error")
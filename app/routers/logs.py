@@ -1,20 +1,33 @@
 # app/routers/logs.py
 import logging
-from typing import Annotated
+from collections.abc import Iterable
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from podman import PodmanClient
-from podman.errors import APIError, NotFound
 
 from app.dependencies import get_podman_client
+from app.errors import map_podman_errors
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/logs", tags=["logs"])
 
 
+def _split_lines(data: Any) -> list[str]:
+    # Split bytes before decoding so a log is never copied into one big str
+    # first; undecodable bytes must not fail the request
+    if isinstance(data, bytes):
+        return [line.decode("utf-8", "replace") for line in data.splitlines()]
+    return str(data).splitlines()
+
+
 @router.get("/{container_id}")
-def get_logs_json(
+@map_podman_errors(
+    "Error fetching logs", not_found="Container {container_id} not found"
+)
+async def get_logs_json(
     container_id: str,
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
     stdout: bool = Query(True),
@@ -22,41 +35,27 @@ def get_logs_json(
     since: str | None = Query(None),
     tail: int | str | None = Query(None),
 ) -> list[str]:
-    try:
-        container = podman_client.containers.get(container_id)
-        logs = container.logs(
-            stream=False, stdout=stdout, stderr=stderr, since=since, tail=tail
-        )
+    container = await run_in_threadpool(podman_client.containers.get, container_id)
+    logs = await run_in_threadpool(
+        container.logs,
+        stream=False,
+        stdout=stdout,
+        stderr=stderr,
+        since=since,
+        tail=tail,
+    )
 
-        lines = []
-        if isinstance(logs, bytes):
-            lines = logs.decode("utf-8").splitlines()
-        elif isinstance(logs, str):
-            lines = logs.splitlines()
-        elif hasattr(logs, "__iter__"):
-            for part in logs:
-                if isinstance(part, bytes):
-                    lines.extend(part.decode("utf-8").splitlines())
-                else:
-                    lines.extend(str(part).splitlines())
-        else:
-            lines = [str(logs)]
-
-        return lines
-    except NotFound:
-        raise HTTPException(
-            status_code=404, detail=f"Container {container_id} not found"
-        )
-    except APIError:
-        logger.exception("Error fetching logs for container %s", container_id)
-        raise HTTPException(status_code=500, detail="Error fetching logs")
-    except Exception:
-        logger.exception("Unexpected error while retrieving logs")
-        raise HTTPException(status_code=500, detail="Unexpected error")
+    # podman-py hands back an iterator of frames even when not streaming
+    if isinstance(logs, (bytes, str)) or not isinstance(logs, Iterable):
+        return _split_lines(logs)
+    return [line for frame in logs for line in _split_lines(frame)]
 
 
 @router.get("/{container_id}/stream")
-def stream_logs(
+@map_podman_errors(
+    "Error streaming logs", not_found="Container {container_id} not found"
+)
+async def stream_logs(
     container_id: str,
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
     stdout: bool = Query(True),
@@ -64,33 +63,22 @@ def stream_logs(
     since: str | None = Query(None),
     tail: int | str | None = Query(None),
 ) -> StreamingResponse:
-    try:
-        container = podman_client.containers.get(container_id)
-        logs = container.logs(
-            stream=True,
-            stdout=stdout,
-            stderr=stderr,
-            since=since,
-            tail=tail,
-        )
-
-        def iter_logs():
-            try:
-                for chunk in logs:
-                    yield chunk if isinstance(chunk, bytes) else str(chunk).encode()
-            except Exception:
-                logger.exception("Error while streaming logs")
-                yield b"\n[ERROR] Stream interrupted.\n"
+    container = await run_in_threadpool(podman_client.containers.get, container_id)
+    logs = await run_in_threadpool(
+        container.logs,
+        stream=True,
+        stdout=stdout,
+        stderr=stderr,
+        since=since,
+        tail=tail,
+    )
 
-        return StreamingResponse(iter_logs(), media_type="text/plain")
+    def iter_logs():
+        try:
+            for chunk in logs:
+                yield chunk if isinstance(chunk, bytes) else str(chunk).encode()
+        except Exception:
+            logger.exception("Error while streaming logs")
+            yield b"\n[ERROR] Stream interrupted.\n"
 
-    except NotFound:
-        raise HTTPException(
-            status_code=404, detail=f"Container {container_id} not found"
-        )
-    except APIError:
-        logger.exception("Error streaming logs for container %s", container_id)
-        raise HTTPException(status_code=500, detail="Error streaming logs")
-    except Exception:
-        logger.exception("Unexpected error while streaming logs")
-        raise HTTPException(status_code=500, detail="Unexpected error")
+    return StreamingResponse(iter_logs(), media_type="text/plain")
@@ -1,31 +1,30 @@
 # app/routers/volumes.py
-import logging
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from podman import PodmanClient
-from podman.errors import APIError, NotFound
 
 from app.dependencies import get_podman_client
+from app.errors import map_podman_errors
 
-logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/volumes", tags=["volumes"])
 
 
-@router.get("")
-def list_volumes(
+@router.get("", response_model=list[dict[str, Any]])
+@map_podman_errors("Failed to list volumes")
+async def list_volumes(
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
-) -> list[dict[str, Any]]:
-    try:
-        volumes = podman_client.volumes.list()
-        return [v.attrs for v in volumes]
-    except APIError:
-        logger.exception("Failed to list volumes")
-        raise HTTPException(status_code=500, detail="Failed to list volumes")
+) -> ORJSONResponse:
+    volumes = await run_in_threadpool(podman_client.volumes.list)
+    # Podman attrs are already JSON-safe; skip validation and jsonable_encoder
+    return ORJSONResponse([v.attrs for v in volumes])
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
-def create_volume(
+@map_podman_errors("Failed to create volume")
+async def create_volume(
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
     name: str = Body(..., embed=True, description="Name of the volume"),
     driver: str = Body("local", embed=True, description="Driver to use"),
@@ -36,47 +35,36 @@ def create_volume(
         None, embed=True, description="Driver options"
     ),
 ) -> dict[str, Any]:
-    try:
-        volume = podman_client.volumes.create(
-            name=name,
-            driver=driver,
-            labels=labels or {},
-            options=options or {},
-        )
-        return volume.attrs
-    except APIError:
-        logger.exception("Failed to create volume")
-        raise HTTPException(status_code=500, detail="Failed to create volume")
+    volume = await run_in_threadpool(
+        podman_client.volumes.create,
+        name=name,
+        driver=driver,
+        labels=labels or {},
+        options=options or {},
+    )
+    return volume.attrs
 
 
 @router.get("/{volume_name}")
-def inspect_volume(
+@map_podman_errors(
+    "Failed to inspect volume", not_found="Volume '{volume_name}' not found"
+)
+async def inspect_volume(
     volume_name: str,
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
 ) -> dict[str, Any]:
-    try:
-        volume = podman_client.volumes.get(volume_name)
-        return volume.attrs
-    except NotFound:
-        raise HTTPException(status_code=404, detail=f"Volume '{volume_name}' not found")
-    except APIError:
-        logger.exception("Failed to inspect volume")
-        raise HTTPException(status_code=500, detail="Failed to inspect volume")
+    volume = await run_in_threadpool(podman_client.volumes.get, volume_name)
+    return volume.attrs
 
 
 @router.delete("/{volume_name}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_volume(
+@map_podman_errors(
+    "Failed to delete volume", not_found="Volume '{volume_name}' not found"
+)
+async def delete_volume(
     volume_name: str,
     podman_client: Annotated[PodmanClient, Depends(get_podman_client)],
     force: bool = Query(False, description="Force deletion even if in use"),
 ) -> None:
-    try:
-        volume = podman_client.volumes.get(volume_name)
-        volume.remove(force=force)
-    except NotFound:
-        raise HTTPException(status_code=404, detail=f"Volume '{volume_name}' not found")
-    except APIError as e:
-        if e.status_code == 409:
-            raise HTTPException(status_code=409, detail=e.explanation)
-        logger.exception("Failed to delete volume")
-        raise HTTPException(status_code=500, detail="Failed to delete volume")
+    volume = await run_in_threadpool(podman_client.volumes.get, volume_name)
+    await run_in_threadpool(volume.remove, force=force)
@@ -9,7 +9,24 @@ logger.setLevel(logging.INFO)
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_prefix="vessel_")
 
+    host: str = "127.0.0.1"
+    port: int = 8000
+    # The list caches live in each worker process and a write only clears its
+    # own worker's copy, so with more workers other workers can serve a stale
+    # list for up to the cache TTL after a run, delete or pull
+    workers: int = 1
+
     podman_socket: str = "unix:///run/podman/podman.sock"
+    # Keep-alive connections to the podman socket; sized above the default
+    # threadpool (40 workers) so concurrent requests don't reconnect
+    podman_num_pools: int = 32
+    podman_max_pool_size: int = 64
+    # Seconds a list_containers result is served from memory
+    containers_cache_ttl: float = 0.5
+    # Seconds the get_images result is served from memory
+    images_cache_ttl: float = 1.0
+    # Seconds the get_info result is served from memory
+    info_cache_ttl: float = 30.0
 
 
 settings = Settings()
@@ -0,0 +1,41 @@
+from typing import Any, Callable
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from podman import PodmanClient
+from podman.api import APIClient
+from podman.domain.containers_manager import ContainersManager
+from podman.domain.images_manager import ImagesManager
+
+from app.dependencies import get_podman_client
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def server_error_client() -> TestClient:
+    # Unhandled exceptions reach the app's 500 handler instead of the test
+    return TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture
+def mock_podman(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    # Serve a mock in place of the Podman client for the duration of a test;
+    # specced so a misspelt podman call fails instead of returning a mock
+    mock_client = MagicMock(spec=PodmanClient)
+    mock_client.api = MagicMock(spec=APIClient)
+    mock_client.containers = MagicMock(spec=ContainersManager)
+    mock_client.images = MagicMock(spec=ImagesManager)
+
+    async def provide_mock_client() -> PodmanClient:
+        return mock_client
+
+    # Widened to the dict's key type so mypy can infer setitem's type argument
+    dependency: Callable[..., Any] = get_podman_client
+    monkeypatch.setitem(app.dependency_overrides, dependency, provide_mock_client)
+    return mock_client
@@ -1,385 +1,429 @@
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
 from unittest.mock import MagicMock
 
+import orjson
+import pytest
 from fastapi.testclient import TestClient
+from podman import PodmanClient
 from podman.errors import APIError, ContainerError, ImageNotFound, NotFound
 from requests.models import Response
 
 from app.dependencies import get_podman_client
 from app.main import app
-
-client = TestClient(app)
+from app.routers import containers as containers_router
+
+# Podman attrs of the stub containers returned by containers.list()
+CONTAINER_1_ATTRS = {
+    "id": "container123",
+    "name": "test-container-1",
+    "image": "nginx:latest",
+    "status": "running",
+    "created": "2023-01-01T00:00:00Z",
+    "labels": {"app": "web"},
+}
+CONTAINER_2_ATTRS = {
+    "id": "container456",
+    "name": "test-container-2",
+    "image": "alpine:latest",
+    "status": "exited",
+    "created": "2023-01-02T00:00:00Z",
+    "labels": {"app": "util"},
+}
+
+# run_container body setting every kind of option at once
+ALL_OPTIONS_PAYLOAD = {
+    "image_name": "nginx:latest",
+    "container_name": "full-options-container",
+    "detach": True,
+    "environment": {"ENV_VAR": "value"},
+    "volumes": {"vol1": {"bind": "/mnt", "mode": "rw"}},
+    "ports": {"80/tcp": 8080},
+    "user": "nginx",
+    "working_dir": "/app",
+    "entrypoint": ["/bin/sh", "-c"],
+    "command": ["nginx", "-g", "daemon off;"],
+    "privileged": True,
+    "network": "host",
+    "labels": {"com.example.label": "value"},
+    "mem_limit": "512m",
+    "restart_policy": {"Name": "always"},
+}
+
+
+def make_container(attrs: dict[str, Any]) -> SimpleNamespace:
+    # Handlers only read from containers, so they need no call tracking
+    return SimpleNamespace(attrs=attrs)
+
+
+@pytest.fixture(autouse=True)
+def clear_list_cache() -> Iterator[None]:
+    containers_router._list_cache.clear()
+    yield
+    containers_router._list_cache.clear()
+
+
+def test_list_containers(client: TestClient, mock_podman: MagicMock) -> None:
+    mock_podman.containers.list.return_value = [
+        make_container(CONTAINER_1_ATTRS),
+        make_container(CONTAINER_2_ATTRS),
+    ]
+
+    # Make the request to the endpoint
+    response = client.get("/api/containers?all=true")
+
+    # Verify the response
+    assert response.status_code == 200
+    containers = response.json()
+    assert len(containers) == 2
+
+    # Verify the first container
+    assert containers[0]["id"] == "container123"
+    assert containers[0]["name"] == "test-container-1"
+    assert containers[0]["image"] == "nginx:latest"
+    assert containers[0]["status"] == "running"
+    assert containers[0]["created"] == "2023-01-01T00:00:00Z"
+    assert containers[0]["labels"] == {"app": "web"}
+
+    # Verify the second container
+    assert containers[1]["id"] == "container456"
+    assert containers[1]["name"] == "test-container-2"
+    assert containers[1]["image"] == "alpine:latest"
+    assert containers[1]["status"] == "exited"
+    assert containers[1]["created"] == "2023-01-02T00:00:00Z"
+    assert containers[1]["labels"] == {"app": "util"}
+
+    # Verify that the mock was called correctly
+    mock_podman.containers.list.assert_called_with(all=True, limit=0, filters=[])
+
+
+@pytest.mark.parametrize(
+    ("query", "expected_kwargs"),
+    [
+        ("", dict(all=False, limit=0, filters=[])),
+        ("?limit=1", dict(all=False, limit=1, filters=[])),
+        (
+            "?status=running",
+            dict(all=False, limit=0, filters=["status=running"]),
+        ),
+        (
+            "?since=abc&before=def",
+            dict(all=False, limit=0, filters=["since=abc", "before=def"]),
+        ),
+        (
+            "?exited=1&name=web",
+            dict(
+                all=False,
+                limit=0,
+                filters=["exited=1", "name=web"],
+            ),
+        ),
+    ],
+)
+def test_list_containers_forwards_query(
+    client: TestClient,
+    mock_podman: MagicMock,
+    query: str,
+    expected_kwargs: dict[str, Any],
+) -> None:
+    mock_podman.containers.list.return_value = [make_container(CONTAINER_1_ATTRS)]
+
+    # Make the request to the endpoint
+    response = client.get("/api/containers" + query)
+
+    # Verify the response
+    assert response.status_code == 200
+    assert response.json() == [CONTAINER_1_ATTRS]
+
+    # Verify that the query was translated into list() arguments
+    mock_podman.containers.list.assert_called_once_with(**expected_kwargs)
+
+
+def test_list_containers_with_multiple_ids(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
+    mock_podman.containers.list.return_value = [
+        make_container(CONTAINER_1_ATTRS),
+        make_container(CONTAINER_2_ATTRS),
+    ]
+
+    # Make the request to the endpoint with repeated id filters
+    response = client.get("/api/containers?all=true&id=container123&id=container456")
+
+    # Verify the response
+    assert response.status_code == 200
+    containers = response.json()
+    assert [c["id"] for c in containers] == ["container123", "container456"]
+
+    # Verify that both ids were sent in a single list call
+    mock_podman.containers.list.assert_called_once_with(
+        all=True,
+        limit=0,
+        filters=["id=container123", "id=container456"],
+    )
 
 
-def test_list_containers() -> None:
-    # Create mock container objects
-    mock_container1 = MagicMock()
-    mock_container1.attrs = {
-        "id": "container123",
-        "name": "test-container-1",
-        "image": "nginx:latest",
-        "status": "running",
-        "created": "2023-01-01T00:00:00Z",
-        "labels": {"app": "web"},
+def test_list_containers_through_podman_py(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # A real client, so podman-py's own list() turns our arguments into the
+    # query; only the HTTP call to the socket is stubbed
+    podman_client = PodmanClient(base_url="unix:///nonexistent/podman.sock")
+    api_get = MagicMock()
+    api_get.return_value.json.return_value = [CONTAINER_1_ATTRS]
+    monkeypatch.setattr(podman_client.api, "get", api_get)
+
+    async def provide_podman_client() -> PodmanClient:
+        return podman_client
+
+    dependency: Callable[..., Any] = get_podman_client
+    monkeypatch.setitem(app.dependency_overrides, dependency, provide_podman_client)
+
+    # Make the request to the endpoint with repeated and since/before filters
+    response = client.get("/api/containers?status=running&id=a&id=b&since=c1&before=c2")
+
+    # Verify the response
+    assert response.status_code == 200
+    assert response.json() == [CONTAINER_1_ATTRS]
+
+    # Verify the filters podman receives
+    api_get.assert_called_once()
+    params = api_get.call_args.kwargs["params"]
+    assert orjson.loads(params["filters"]) == {
+        "before": ["c2"],
+        "id": ["a", "b"],
+        "since": ["c1"],
+        "status": ["running"],
     }
 
-    mock_container2 = MagicMock()
-    mock_container2.attrs = {
-        "id": "container456",
-        "name": "test-container-2",
-        "image": "alpine:latest",
-        "status": "exited",
-        "created": "2023-01-02T00:00:00Z",
-        "labels": {"app": "util"},
-    }
 
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.containers = MagicMock()
-    mock_client.containers.list.return_value = [mock_container1, mock_container2]
-
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-    try:
-        # Make the request to the endpoint
-        response = client.get("/api/containers?all=true")
-
-        # Verify the response
-        assert response.status_code == 200
-        containers = response.json()
-        assert len(containers) == 2
-
-        # Verify the first container
-        assert containers[0]["id"] == "container123"
-        assert containers[0]["name"] == "test-container-1"
-        assert containers[0]["image"] == "nginx:latest"
-        assert containers[0]["status"] == "running"
-        assert containers[0]["created"] == "2023-01-01T00:00:00Z"
-        assert containers[0]["labels"] == {"app": "web"}
-
-        # Verify the second container
-        assert containers[1]["id"] == "container456"
-        assert containers[1]["name"] == "test-container-2"
-        assert containers[1]["image"] == "alpine:latest"
-        assert containers[1]["status"] == "exited"
-        assert containers[1]["created"] == "2023-01-02T00:00:00Z"
-        assert containers[1]["labels"] == {"app": "util"}
-
-        # Verify that the mock was called correctly
-        mock_client.containers.list.assert_called_with(
-            all=True, since=None, before=None, limit=0, filters={}
-        )
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_list_containers_with_limit() -> None:
-    # Create mock container objects
-    mock_container = MagicMock()
-    mock_container.attrs = {
-        "id": "container123",
-        "name": "test-container",
-        "image": "nginx:latest",
-        "status": "running",
-        "created": "2023-01-01T00:00:00Z",
-        "labels": {"app": "web"},
-    }
+def test_list_containers_served_from_cache(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
+    mock_podman.containers.list.return_value = []
 
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.containers = MagicMock()
-    mock_client.containers.list.return_value = [mock_container]
+    # Repeated identical queries hit podman once
+    assert client.get("/api/containers?all=true").json() == []
+    assert client.get("/api/containers?all=true").json() == []
+    mock_podman.containers.list.assert_called_once()
 
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
+    # A different query is fetched separately
+    client.get("/api/containers")
+    assert mock_podman.containers.list.call_count == 2
 
-    try:
-        # Make the request to the endpoint with limit parameter
-        response = client.get("/api/containers?limit=1")
+    # Deleting a container invalidates cached results
+    client.delete("/api/containers/container123")
+    client.get("/api/containers?all=true")
+    assert mock_podman.containers.list.call_count == 3
 
-        # Verify the response
-        assert response.status_code == 200
-        containers = response.json()
-        assert len(containers) == 1
 
-        # Verify the container details
-        assert containers[0]["id"] == "container123"
-        assert containers[0]["name"] == "test-container"
+def test_list_containers_api_error(client: TestClient, mock_podman: MagicMock) -> None:
+    mock_podman.containers.list.side_effect = APIError("API Error")
 
-        # Verify that the mock was called correctly with limit parameter
-        mock_client.containers.list.assert_called_with(
-            all=False, since=None, limit=1, before=None, filters={}
-        )
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
+    # Make the request to the endpoint
+    response = client.get("/api/containers")
 
+    # Verify the response
+    assert response.status_code == 500
+    assert "Error listing containers" in response.json()["detail"]
 
-def test_list_containers_with_filters() -> None:
-    # Create mock container objects
-    mock_container = MagicMock()
-    mock_container.attrs = {
-        "id": "container123",
-        "name": "test-container",
-        "image": "nginx:latest",
-        "status": "running",
-        "created": "2023-01-01T00:00:00Z",
-        "labels": {"app": "web"},
-    }
+    # Verify that the mock was called correctly
+    mock_podman.containers.list.assert_called_with(all=False, limit=0, filters=[])
 
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.containers = MagicMock()
-    mock_client.containers.list.return_value = [mock_container]
-
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-    try:
-        # Make the request to the endpoint with status filter
-        response = client.get("/api/containers?status=running")
-
-        # Verify the response
-        assert response.status_code == 200
-        containers = response.json()
-        assert len(containers) == 1
-
-        # Verify the container details
-        assert containers[0]["id"] == "container123"
-        assert containers[0]["status"] == "running"
-
-        # Verify that the mock was called correctly with filters parameter
-        mock_client.containers.list.assert_called_with(
-            all=False, since=None, before=None, limit=0, filters={"status": "running"}
-        )
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_list_containers_empty() -> None:
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.containers = MagicMock()
-    mock_client.containers.list.return_value = []
-
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-    try:
-        # Make the request to the endpoint
-        response = client.get("/api/containers")
-
-        # Verify the response
-        assert response.status_code == 200
-        containers = response.json()
-        assert len(containers) == 0
-        assert containers == []
-
-        # Verify that the mock was called correctly
-        mock_client.containers.list.assert_called_with(
-            all=False, since=None, before=None, limit=0, filters={}
-        )
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_list_containers_api_error() -> None:
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.containers = MagicMock()
-    mock_client.containers.list.side_effect = APIError("API Error")
-
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-    try:
-        # Make the request to the endpoint
-        response = client.get("/api/containers")
-
-        # Verify the response
-        assert response.status_code == 500
-        assert "Error listing containers" in response.json()["detail"]
-
-        # Verify that the mock was called correctly
-        mock_client.containers.list.assert_called_with(
-            all=False, since=None, before=None, limit=0, filters={}
-        )
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_run_container_detached() -> None:
-    # Create a mock for the Container object
-    mock_container = MagicMock()
-    mock_container.id = "container123"
-    mock_container.name = "test-container"
-
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.containers.run.return_value = mock_container
-
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-    try:
-        # Make the request to the endpoint
-        response = client.post(
-            "/api/containers",
-            json={
-                "image_name": "nginx:latest",
-                "detach": True,
-                "container_name": "test-container",
-            },
-        )
-
-        # Verify the response
-        assert response.status_code == 200
-        assert response.json() == {
-            "status": "success",
-            "message": "Container started from image nginx:latest",
-            "container_id": "container123",
+
+def test_run_container_detached(client: TestClient, mock_podman: MagicMock) -> None:
+    # Create a stub for the started container
+    container = SimpleNamespace(id="container123", name="test-container")
+
+    mock_podman.containers.run.return_value = container
+
+    # Make the request to the endpoint
+    response = client.post(
+        "/api/containers",
+        json={
+            "image_name": "nginx:latest",
+            "detach": True,
             "container_name": "test-container",
-        }
-
-        # Verify that the mock was called correctly
-        mock_client.containers.run.assert_called_with(
-            image="nginx:latest",
-            command=None,
-            remove=False,
-            name="test-container",
-            detach=True,
-        )
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_run_container_with_command() -> None:
+        },
+    )
+
+    # Verify the response
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "success",
+        "message": "Container started from image nginx:latest",
+        "container_id": "container123",
+        "container_name": "test-container",
+    }
+
+    # Verify that the mock was called correctly
+    mock_podman.containers.run.assert_called_with(
+        image="nginx:latest",
+        command=None,
+        remove=False,
+        name="test-container",
+        detach=True,
+    )
+
+
+def test_run_container_with_command(client: TestClient, mock_podman: MagicMock) -> None:
     # Create a mock for the container output
     mock_output = b"Hello, World!"
 
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.containers.run.return_value = mock_output
-
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-    try:
-        # Make the request to the endpoint
-        response = client.post(
-            "/api/containers",
-            json={
-                "image_name": "alpine:latest",
-                "command": ["echo", "Hello, World!"],
-                "remove": True,
-            },
-        )
-
-        # Verify the response
-        assert response.status_code == 200
-        assert response.json() == {
-            "status": "success",
-            "message": "Container from image alpine:latest completed",
-            "output": "Hello, World!",
-        }
-
-        # Verify that the mock was called correctly
-        mock_client.containers.run.assert_called_with(
-            image="alpine:latest",
-            command=["echo", "Hello, World!"],
-            remove=True,
-        )
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_run_container_with_environment_and_volumes() -> None:
+    mock_podman.containers.run.return_value = mock_output
+
+    # Make the request to the endpoint
+    response = client.post(
+        "/api/containers",
+        json={
+            "image_name": "alpine:latest",
+            "command": ["echo", "Hello, World!"],
+            "remove": True,
+        },
+    )
+
+    # Verify the response
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "success",
+        "message": "Container from image alpine:latest completed",
+        "output": "Hello, World!",
+    }
+
+    # Verify that the mock was called correctly
+    mock_podman.containers.run.assert_called_with(
+        image="alpine:latest",
+        command=["echo", "Hello, World!"],
+        remove=True,
+    )
+
+
+def test_run_container_replaces_undecodable_output(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
+    # Output cut off in the middle of a multi-byte UTF-8 character
+    mock_output = "naïve".encode()[:3]
+
+    mock_podman.containers.run.return_value = mock_output
+
+    # Make the request to the endpoint
+    response = client.post("/api/containers", json={"image_name": "alpine:latest"})
+
+    # Verify the response
+    assert response.status_code == 200
+    assert response.json()["output"] == "na\ufffd"
+
+
+def test_run_container_streams_iterator_output(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
+    # Create a mock for the container output stream
+    mock_output = iter([b"Hello, ", "World!"])
+
+    mock_podman.containers.run.return_value = mock_output
+
+    # Make the request to the endpoint
+    response = client.post(
+        "/api/containers",
+        json={
+            "image_name": "alpine:latest",
+            "command": ["echo", "Hello, World!"],
+            "stream": True,
+        },
+    )
+
+    # Verify the response is streamed as plain text
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text == "Hello, World!"
+
+    # Verify podman was asked for the output as a stream
+    mock_podman.containers.run.assert_called_with(
+        image="alpine:latest",
+        command=["echo", "Hello, World!"],
+        remove=False,
+        stream=True,
+    )
+
+
+def test_run_container_with_environment_and_volumes(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
     # Create a mock for the container output
     mock_output = b"Container started"
 
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.containers.run.return_value = mock_output
-
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-    try:
-        # Make the request to the endpoint
-        response = client.post(
-            "/api/containers",
-            json={
-                "image_name": "postgres:13",
-                "environment": {"POSTGRES_PASSWORD": "mysecretpassword"},
-                "volumes": {
-                    "pgdata": {"bind": "/var/lib/postgresql/data", "mode": "rw"}
-                },
-            },
-        )
-
-        # Verify the response
-        assert response.status_code == 200
-        assert response.json() == {
-            "status": "success",
-            "message": "Container from image postgres:13 completed",
-            "output": "Container started",
-        }
-
-        # Verify that the mock was called correctly
-        mock_client.containers.run.assert_called_with(
-            image="postgres:13",
-            command=None,
-            remove=False,
-            environment={"POSTGRES_PASSWORD": "mysecretpassword"},
-            volumes={"pgdata": {"bind": "/var/lib/postgresql/data", "mode": "rw"}},
-        )
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_run_container_image_not_found() -> None:
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.containers.run.side_effect = ImageNotFound("Image not found")
-
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-    try:
-        # Make the request to the endpoint
-        response = client.post(
-            "/api/containers",
-            json={
-                "image_name": "nonexistent:latest",
-            },
-        )
-
-        # Verify the response
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"]
-
-        # Verify that the mock was called correctly
-        mock_client.containers.run.assert_called_with(
-            image="nonexistent:latest",
-            command=None,
-            remove=False,
-        )
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_run_container_error() -> None:
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
+    mock_podman.containers.run.return_value = mock_output
+
+    # Make the request to the endpoint
+    response = client.post(
+        "/api/containers",
+        json={
+            "image_name": "postgres:13",
+            "environment": {"POSTGRES_PASSWORD": "mysecretpassword"},
+            "volumes": {"pgdata": {"bind": "/var/lib/postgresql/data", "mode": "rw"}},
+        },
+    )
+
+    # Verify the response
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "success",
+        "message": "Container from image postgres:13 completed",
+        "output": "Container started",
+    }
+
+    # Verify that the mock was called correctly
+    mock_podman.containers.run.assert_called_with(
+        image="postgres:13",
+        command=None,
+        remove=False,
+        environment={"POSTGRES_PASSWORD": "mysecretpassword"},
+        volumes={"pgdata": {"bind": "/var/lib/postgresql/data", "mode": "rw"}},
+    )
+
+
+def test_run_container_image_not_found(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
+    mock_podman.containers.run.side_effect = ImageNotFound("Image not found")
+
+    # Make the request to the endpoint
+    response = client.post(
+        "/api/containers",
+        json={
+            "image_name": "nonexistent:latest",
+        },
+    )
+
+    # Verify the response
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Image nonexistent:latest not found"}
+
+    # Verify that the mock was called correctly
+    mock_podman.containers.run.assert_called_with(
+        image="nonexistent:latest",
+        command=None,
+        remove=False,
+    )
 
+
+def test_run_container_network_not_found(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
+    mock_podman.containers.run.side_effect = NotFound("network not found")
+
+    # Make the request to the endpoint
+    response = client.post(
+        "/api/containers",
+        json={"image_name": "alpine:latest", "network": "missing"},
+    )
+
+    # A missing network is not blamed on the image
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Not found"}
+
+
+def test_run_container_error(client: TestClient, mock_podman: MagicMock) -> None:
     # Create a mock container for the error
     mock_container = MagicMock()
     mock_container.id = "container123"
@@ -392,229 +436,186 @@ def test_run_container_error() -> None:
         image="alpine:latest",
     )
 
-    mock_client.containers.run.side_effect = container_error
-
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-    try:
-        # Make the request to the endpoint
-        response = client.post(
-            "/api/containers",
-            json={
-                "image_name": "alpine:latest",
-                "command": ["echo", "test"],
-            },
-        )
-
-        # Verify the response
-        assert response.status_code == 500
-        assert "Container error" in response.json()["detail"]
-        assert "Exit code: 1" in response.json()["detail"]
-
-        # Verify that the mock was called correctly
-        mock_client.containers.run.assert_called_with(
-            image="alpine:latest",
-            command=["echo", "test"],
-            remove=False,
-        )
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_run_container_api_error() -> None:
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.containers.run.side_effect = APIError("API Error")
-
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-    try:
-        # Make the request to the endpoint
-        response = client.post(
-            "/api/containers",
-            json={
-                "image_name": "nginx:latest",
-            },
-        )
-
-        # Verify the response
-        assert response.status_code == 500
-        assert "Error running container" in response.json()["detail"]
-
-        # Verify that the mock was called correctly
-        mock_client.containers.run.assert_called_with(
-            image="nginx:latest",
-            command=None,
-            remove=False,
-        )
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_run_container_with_all_options() -> None:
-    # Create a mock for the Container object
-    mock_container = MagicMock()
-    mock_container.id = "container456"
-    mock_container.name = "full-options-container"
-
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.containers.run.return_value = mock_container
-
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-    try:
-        # Make the request to the endpoint with many options
-        response = client.post(
-            "/api/containers",
-            json={
-                "image_name": "nginx:latest",
-                "container_name": "full-options-container",
-                "detach": True,
-                "environment": {"ENV_VAR": "value"},
-                "volumes": {"vol1": {"bind": "/mnt", "mode": "rw"}},
-                "ports": {"80/tcp": 8080},
-                "user": "nginx",
-                "working_dir": "/app",
-                "entrypoint": ["/bin/sh", "-c"],
-                "command": ["nginx", "-g", "daemon off;"],
-                "privileged": True,
-                "network": "host",
-                "labels": {"com.example.label": "value"},
-                "mem_limit": "512m",
-                "restart_policy": {"Name": "always"},
-            },
-        )
-
-        # Verify the response
-        assert response.status_code == 200
-        assert response.json() == {
-            "status": "success",
-            "message": "Container started from image nginx:latest",
-            "container_id": "container456",
-            "container_name": "full-options-container",
-        }
-
-        # Verify that the mock was called with all the options
-        mock_client.containers.run.assert_called_once()
-        call_args = mock_client.containers.run.call_args[1]
-
-        assert call_args["image"] == "nginx:latest"
-        assert call_args["command"] == ["nginx", "-g", "daemon off;"]
-        assert call_args["name"] == "full-options-container"
-        assert call_args["detach"] is True
-        assert call_args["environment"] == {"ENV_VAR": "value"}
-        assert call_args["volumes"] == {"vol1": {"bind": "/mnt", "mode": "rw"}}
-        assert call_args["ports"] == {"80/tcp": 8080}
-        assert call_args["user"] == "nginx"
-        assert call_args["working_dir"] == "/app"
-        assert call_args["entrypoint"] == ["/bin/sh", "-c"]
-        assert call_args["privileged"] is True
-        assert call_args["network"] == "host"
-        assert call_args["labels"] == {"com.example.label": "value"}
-        assert call_args["mem_limit"] == "512m"
-        assert call_args["restart_policy"] == {"Name": "always"}
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_delete_container_success():
-    container = MagicMock()
-    container.remove.return_value = None
-
-    mock_client = MagicMock()
-    mock_client.containers.get.return_value = container
-
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-    try:
-        response = client.delete("/api/containers/mycontainer")
-        assert response.status_code == 204
-        container.remove.assert_called_once_with(force=False)
-    finally:
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_delete_container_force():
-    container = MagicMock()
-    container.remove.return_value = None
-
-    mock_client = MagicMock()
-    mock_client.containers.get.return_value = container
-
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-    try:
-        response = client.delete("/api/containers/mycontainer?force=true")
-        assert response.status_code == 204
-        container.remove.assert_called_once_with(force=True)
-    finally:
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_delete_container_not_found():
-    mock_client = MagicMock()
-    mock_client.containers.get.side_effect = NotFound("not found")
-
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-    try:
-        response = client.delete("/api/containers/missing")
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"]
-    finally:
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_delete_container_conflict():
-    container = MagicMock()
+    mock_podman.containers.run.side_effect = container_error
+
+    # Make the request to the endpoint
+    response = client.post(
+        "/api/containers",
+        json={
+            "image_name": "alpine:latest",
+            "command": ["echo", "test"],
+        },
+    )
+
+    # Verify the response
+    assert response.status_code == 500
+    detail = response.json()["detail"]
+    assert "Container error" in detail
+    assert "Exit code: 1" in detail
+
+    # Verify that the mock was called correctly
+    mock_podman.containers.run.assert_called_with(
+        image="alpine:latest",
+        command=["echo", "test"],
+        remove=False,
+    )
+
+
+def test_run_container_api_error(client: TestClient, mock_podman: MagicMock) -> None:
+    mock_podman.containers.run.side_effect = APIError("API Error")
+
+    # Make the request to the endpoint
+    response = client.post(
+        "/api/containers",
+        json={
+            "image_name": "nginx:latest",
+        },
+    )
+
+    # Verify the response
+    assert response.status_code == 500
+    assert "Error running container" in response.json()["detail"]
+
+    # Verify that the mock was called correctly
+    mock_podman.containers.run.assert_called_with(
+        image="nginx:latest",
+        command=None,
+        remove=False,
+    )
+
+
+def test_run_container_with_all_options(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
+    # Create a stub for the started container
+    container = SimpleNamespace(id="container456", name="full-options-container")
+
+    mock_podman.containers.run.return_value = container
+
+    # Make the request to the endpoint with many options
+    response = client.post(
+        "/api/containers",
+        json=ALL_OPTIONS_PAYLOAD,
+    )
+
+    # Verify the response
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "success",
+        "message": "Container started from image nginx:latest",
+        "container_id": "container456",
+        "container_name": "full-options-container",
+    }
+
+    # Verify that the mock was called with all the options
+    mock_podman.containers.run.assert_called_once()
+    call_args = mock_podman.containers.run.call_args[1]
+
+    assert call_args["image"] == "nginx:latest"
+    assert call_args["command"] == ["nginx", "-g", "daemon off;"]
+    assert call_args["name"] == "full-options-container"
+    assert call_args["detach"] is True
+    assert call_args["environment"] == {"ENV_VAR": "value"}
+    assert call_args["volumes"] == {"vol1": {"bind": "/mnt", "mode": "rw"}}
+    assert call_args["ports"] == {"80/tcp": 8080}
+    assert call_args["user"] == "nginx"
+    assert call_args["working_dir"] == "/app"
+    assert call_args["entrypoint"] == ["/bin/sh", "-c"]
+    assert call_args["privileged"] is True
+    assert call_args["network"] == "host"
+    assert call_args["labels"] == {"com.example.label": "value"}
+    assert call_args["mem_limit"] == "512m"
+    assert call_args["restart_policy"] == {"Name": "always"}
+
+
+def test_run_container_forwards_falsy_values_only_where_meaningful(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
+    mock_podman.containers.run.return_value = b""
+
+    # init/oom_score_adj are forwarded when falsy, privileged/user are not
+    response = client.post(
+        "/api/containers",
+        json={
+            "image_name": "alpine:latest",
+            "privileged": False,
+            "user": "",
+            "init": False,
+            "oom_score_adj": 0,
+        },
+    )
+
+    # Verify the response
+    assert response.status_code == 200
+
+    # Verify that the mock was called correctly
+    mock_podman.containers.run.assert_called_with(
+        image="alpine:latest",
+        command=None,
+        remove=False,
+        init=False,
+        oom_score_adj=0,
+    )
+
+
+def test_run_container_rejects_unknown_fields(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
+    # A misspelled option is rejected instead of silently ignored
+    response = client.post(
+        "/api/containers",
+        json={"image_name": "alpine:latest", "privleged": True},
+    )
+
+    # Verify the response
+    assert response.status_code == 422
+    mock_podman.containers.run.assert_not_called()
+
+
+@pytest.mark.parametrize(("query", "force"), [("", False), ("?force=true", True)])
+def test_delete_container_success(
+    client: TestClient, mock_podman: MagicMock, query: str, force: bool
+) -> None:
+    mock_podman.containers.remove.return_value = None
+
+    response = client.delete("/api/containers/mycontainer" + query)
+    assert response.status_code == 204
+    mock_podman.containers.remove.assert_called_once_with("mycontainer", force=force)
+
+
+def test_delete_container_not_found(client: TestClient, mock_podman: MagicMock) -> None:
+    mock_podman.containers.remove.side_effect = NotFound("not found")
+
+    response = client.delete("/api/containers/missing")
+    assert response.status_code == 404
+    assert "not found" in response.json()["detail"]
+
+
+def test_delete_container_conflict(client: TestClient, mock_podman: MagicMock) -> None:
     response_ = Response()
     response_.status_code = 409
     error = APIError("conflict", response=response_, explanation="Container is in use")
-    container.remove.side_effect = error
-
-    mock_client = MagicMock()
-    mock_client.containers.get.return_value = container
-
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-    try:
-        response = client.delete("/api/containers/locked")
-        assert response.status_code == 409
-        assert "Container is in use" in response.json()["detail"]
-    finally:
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_delete_container_api_error():
-    container = MagicMock()
-    container.remove.side_effect = APIError("server error")
-
-    mock_client = MagicMock()
-    mock_client.containers.get.return_value = container
-
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-    try:
-        response = client.delete("/api/containers/broken")
-        assert response.status_code == 500
-        assert "Error deleting container" in response.json()["detail"]
-    finally:
-        app.dependency_overrides.pop(get_podman_client)
-
-
-def test_delete_container_unexpected_exception():
-    container = MagicMock()
-    container.remove.side_effect = Exception("unexpected")
-
-    mock_client = MagicMock()
-    mock_client.containers.get.return_value = container
-
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
-    try:
-        response = client.delete("/api/containers/error")
-        assert response.status_code == 500
-        assert "Unexpected error" in response.json()["detail"]
-    finally:
-        app.dependency_overrides.pop(get_podman_client)
+
+    mock_podman.containers.remove.side_effect = error
+
+    response = client.delete("/api/containers/locked")
+    assert response.status_code == 409
+    assert "Container is in use" in response.json()["detail"]
+
+
+def test_delete_container_api_error(client: TestClient, mock_podman: MagicMock) -> None:
+    mock_podman.containers.remove.side_effect = APIError("server error")
+
+    response = client.delete("/api/containers/broken")
+    assert response.status_code == 500
+    assert "Error deleting container" in response.json()["detail"]
+
+
+def test_delete_container_unexpected_exception(
+    server_error_client: TestClient, mock_podman: MagicMock
+) -> None:
+    mock_podman.containers.remove.side_effect = Exception("unexpected")
+
+    response = server_error_client.delete("/api/containers/error")
+    assert response.status_code == 500
+    assert "Unexpected error" in response.json()["detail"]
@@ -0,0 +1,44 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import dependencies
+from app.dependencies import get_podman_client
+from app.main import app
+from app.settings import settings
+
+
+def test_get_podman_client_is_shared() -> None:
+    assert asyncio.run(get_podman_client()) is asyncio.run(get_podman_client())
+
+
+def test_podman_client_uses_connection_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    mock_podman_client = MagicMock()
+    monkeypatch.setattr(dependencies, "PodmanClient", mock_podman_client)
+    dependencies._podman_client.cache_clear()
+
+    try:
+        asyncio.run(get_podman_client())
+    finally:
+        dependencies._podman_client.cache_clear()
+
+    mock_podman_client.assert_called_once_with(
+        base_url=dependencies._SOCKET,
+        num_pools=settings.podman_num_pools,
+        max_pool_size=settings.podman_max_pool_size,
+    )
+
+
+def test_lifespan_pings_and_closes_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    mock_client = MagicMock()
+    monkeypatch.setattr(
+        dependencies, "_podman_client", MagicMock(return_value=mock_client)
+    )
+
+    with TestClient(app):
+        mock_client.ping.assert_called_once()
+        mock_client.close.assert_not_called()
+
+    mock_client.close.assert_called_once()
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from podman.errors import APIError, ImageNotFound, NotFound
+from requests.models import Response
+
+from app.errors import map_podman_errors
+from app.main import app
+
+client = TestClient(app)
+
+
+def _raise(exc: Exception) -> HTTPException:
+    @map_podman_errors("Error doing thing", not_found="Thing {name} not found")
+    async def endpoint(name: str) -> None:
+        raise exc
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(endpoint(name="foo"))
+    return exc_info.value
+
+
+@pytest.mark.parametrize("exc", [NotFound("gone"), ImageNotFound("gone")])
+def test_not_found_is_formatted_from_arguments(exc: Exception) -> None:
+    error = _raise(exc)
+    assert error.status_code == 404
+    assert error.detail == "Thing foo not found"
+
+
+def test_conflict_passes_explanation_through() -> None:
+    response = Response()
+    response.status_code = 409
+    error = _raise(APIError("Conflict", response=response, explanation="in use"))
+    assert error.status_code == 409
+    assert error.detail == "in use"
+
+
+def test_api_error_uses_static_detail() -> None:
+    error = _raise(APIError("boom"))
+    assert error.status_code == 500
+    assert error.detail == "Error doing thing"
+
+
+def test_unexpected_error_propagates() -> None:
+    @map_podman_errors("Error doing thing")
+    async def endpoint() -> None:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(endpoint())
+
+
+def test_http_exception_is_left_alone() -> None:
+    error = _raise(HTTPException(status_code=400, detail="Bad request"))
+    assert error.status_code == 400
+    assert error.detail == "Bad request"
+
+
+def test_http_exceptions_render_as_json() -> None:
+    response = client.get("/api/does-not-exist")
+    assert response.status_code == 404
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"detail": "Not Found"}
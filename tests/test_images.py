@@ -1,459 +1,390 @@
+from typing import Iterator
 from unittest.mock import MagicMock
 
+import orjson
+import pytest
 from fastapi.testclient import TestClient
 from podman.errors import APIError, ImageNotFound
 from requests.models import Response
 
-from app.dependencies import get_podman_client
-from app.main import app
-
-client = TestClient(app)
-
-
-def test_get_images() -> None:
-    # Create mock image objects with tags property
-    mock_image1 = MagicMock()
-    attrs1 = {
-        "Arch": "arm64",
-        "Containers": 4,
-        "Created": 1716689914,
-        "Digest": "sha256:41316c18917a27a359ee3191fd8f43559d30592f82a144bbc59d9d44790f6e7a",
-        "History": ["quay.io/podman/hello:latest"],
-        "Id": "83fc7ce1224f5ed3885f6aaec0bb001c0bbb2a308e3250d7408804a720c72a32",
-        "IsManifestList": False,
-        "Labels": {
-            "artist": "Máirín Ní Ḋuḃṫaiġ, X/Twitter:@mairin",
-            "io.buildah.version": "1.23.1",
-            "io.containers.capabilities": "sys_chroot",
-            "maintainer": "Podman Maintainers",
-            "org.opencontainers.image.description": "Hello world image with ascii art",
-            "org.opencontainers.image.documentation": "https://github.com/containers/PodmanHello/blob/76b262056eae09851d0a952d0f42b5bbeedde471/README.md",
-            "org.opencontainers.image.revision": "76b262056eae09851d0a952d0f42b5bbeedde471",
-            "org.opencontainers.image.source": "https://raw.githubusercontent.com/containers/PodmanHello/76b262056eae09851d0a952d0f42b5bbeedde471/Containerfile",
-            "org.opencontainers.image.title": "hello image",
-            "org.opencontainers.image.url": "https://github.com/containers/PodmanHello/actions/runs/9239934617",
-        },
-        "Names": ["quay.io/podman/hello:latest"],
-        "Os": "linux",
-        "ParentId": "",
-        "RepoDigests": [
-            "quay.io/podman/hello@sha256:41316c18917a27a359ee3191fd8f43559d30592f82a144bbc59d9d44790f6e7a",
-            "quay.io/podman/hello@sha256:5c44ef36dc5e35a76904da0e028cf9413e0176a653525162368af13fed03571c",
-        ],
-        "RepoTags": ["quay.io/podman/hello:latest"],
-        "SharedSize": 0,
-        "Size": 579593,
-        "VirtualSize": 579593,
-    }
-    mock_image1.attrs = attrs1
-
-    mock_image2 = MagicMock()
-    attrs2 = {
-        "Arch": "arm64",
-        "Containers": 0,
-        "Created": 1624422849,
-        "Digest": "sha256:47ae43cdfc7064d28800bc42e79a429540c7c80168e8c8952778c0d5af1c09db",
-        "History": ["docker.io/library/nginx:1.21.0"],
-        "Id": "d868a2ccd9b148b984a40e49ab0b16e1434d5bca8f0bf8f2714ce7352c3d4555",
-        "IsManifestList": False,
-        "Labels": {"maintainer": "NGINX Docker Maintainers <docker-maint@nginx.com>"},
-        "Names": ["docker.io/library/nginx:1.21.0"],
-        "Os": "linux",
-        "ParentId": "",
-        "RepoDigests": [
-            "docker.io/library/nginx@sha256:47ae43cdfc7064d28800bc42e79a429540c7c80168e8c8952778c0d5af1c09db",
-            "docker.io/library/nginx@sha256:7c91baa42a9371c925b909701b84ee543aa2d6e9fda4543225af2e17f531a243",
-        ],
-        "RepoTags": ["docker.io/library/nginx:1.21.0"],
-        "SharedSize": 0,
-        "Size": 130092990,
-        "VirtualSize": 130092990,
-    }
-    mock_image2.attrs = attrs2
+from app.routers import images as images_router
+
+# Podman's image summaries as returned by /images/json
+IMAGE_1 = {
+    "Arch": "arm64",
+    "Containers": 4,
+    "Created": 1716689914,
+    "Digest": "sha256:41316c18917a27a359ee3191fd8f43559d30592f82a144bbc59d9d44790f6e7a",
+    "History": ["quay.io/podman/hello:latest"],
+    "Id": "83fc7ce1224f5ed3885f6aaec0bb001c0bbb2a308e3250d7408804a720c72a32",
+    "IsManifestList": False,
+    "Labels": {
+        "artist": "Máirín Ní Ḋuḃṫaiġ, X/Twitter:@mairin",
+        "io.buildah.version": "1.23.1",
+        "io.containers.capabilities": "sys_chroot",
+        "maintainer": "Podman Maintainers",
+        "org.opencontainers.image.description": "Hello world image with ascii art",
+        "org.opencontainers.image.documentation": "https://github.com/containers/PodmanHello/blob/76b262056eae09851d0a952d0f42b5bbeedde471/README.md",
+        "org.opencontainers.image.revision": "76b262056eae09851d0a952d0f42b5bbeedde471",
+        "org.opencontainers.image.source": "https://raw.githubusercontent.com/containers/PodmanHello/76b262056eae09851d0a952d0f42b5bbeedde471/Containerfile",
+        "org.opencontainers.image.title": "hello image",
+        "org.opencontainers.image.url": "https://github.com/containers/PodmanHello/actions/runs/9239934617",
+    },
+    "Names": ["quay.io/podman/hello:latest"],
+    "Os": "linux",
+    "ParentId": "",
+    "RepoDigests": [
+        "quay.io/podman/hello@sha256:41316c18917a27a359ee3191fd8f43559d30592f82a144bbc59d9d44790f6e7a",
+        "quay.io/podman/hello@sha256:5c44ef36dc5e35a76904da0e028cf9413e0176a653525162368af13fed03571c",
+    ],
+    "RepoTags": ["quay.io/podman/hello:latest"],
+    "SharedSize": 0,
+    "Size": 579593,
+    "VirtualSize": 579593,
+}
+
+IMAGE_2 = {
+    "Arch": "arm64",
+    "Containers": 0,
+    "Created": 1624422849,
+    "Digest": "sha256:47ae43cdfc7064d28800bc42e79a429540c7c80168e8c8952778c0d5af1c09db",
+    "History": ["docker.io/library/nginx:1.21.0"],
+    "Id": "d868a2ccd9b148b984a40e49ab0b16e1434d5bca8f0bf8f2714ce7352c3d4555",
+    "IsManifestList": False,
+    "Labels": {"maintainer": "NGINX Docker Maintainers <docker-maint@nginx.com>"},
+    "Names": ["docker.io/library/nginx:1.21.0"],
+    "Os": "linux",
+    "ParentId": "",
+    "RepoDigests": [
+        "docker.io/library/nginx@sha256:47ae43cdfc7064d28800bc42e79a429540c7c80168e8c8952778c0d5af1c09db",
+        "docker.io/library/nginx@sha256:7c91baa42a9371c925b909701b84ee543aa2d6e9fda4543225af2e17f531a243",
+    ],
+    "RepoTags": ["docker.io/library/nginx:1.21.0"],
+    "SharedSize": 0,
+    "Size": 130092990,
+    "VirtualSize": 130092990,
+}
+IMAGES = [IMAGE_1, IMAGE_2]
+
+
+@pytest.fixture(autouse=True)
+def clear_images_cache() -> Iterator[None]:
+    images_router._images_cache.clear()
+    yield
+    images_router._images_cache.clear()
+
+
+def test_get_images(client: TestClient, mock_podman: MagicMock) -> None:
+    mock_podman.api.get.return_value.content = orjson.dumps(IMAGES)
+
+    # Make the request to the endpoint
+    response = client.get("/api/images")
+
+    # Verify the response
+    assert response.status_code == 200
+    assert response.json() == IMAGES
+    assert "Accept" in response.headers["vary"].split(", ")
+
+    # Verify that the mock was called correctly
+    mock_podman.api.get.assert_called_once_with("/images/json")
+
+
+def test_get_images_as_ndjson(client: TestClient, mock_podman: MagicMock) -> None:
+    mock_podman.api.get.return_value.content = b'[{"Id": "image1"}, {"Id": "image2"}]'
+
+    # Make the request to the endpoint asking for NDJSON
+    response = client.get("/api/images", headers={"Accept": "application/x-ndjson"})
+
+    # Verify the response
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["vary"] == "Accept"
+    assert response.text.splitlines() == ['{"Id":"image1"}', '{"Id":"image2"}']
+
+
+def test_get_images_not_found_is_empty(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
+    mock_podman.api.get.return_value.status_code = 404
+
+    # Make the request to the endpoint
+    response = client.get("/api/images")
+
+    # Verify the response is an empty list, not an error
+    assert response.status_code == 200
+    assert response.json() == []
+    mock_podman.api.get.return_value.raise_for_status.assert_not_called()
+
+
+def test_get_images_error(client: TestClient, mock_podman: MagicMock) -> None:
+    mock_podman.api.get.return_value.status_code = 500
+    mock_podman.api.get.return_value.raise_for_status.side_effect = APIError("boom")
+
+    # Make the request to the endpoint
+    response = client.get("/api/images")
+
+    # Verify other podman errors still fail the request
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Error listing images"}
+
+
+def test_get_images_served_from_cache(
+    client: TestClient, mock_podman: MagicMock
+) -> None:
+    mock_podman.api.get.return_value.content = b"[]"
+
+    # Repeated requests hit podman once
+    assert client.get("/api/images").json() == []
+    assert client.get("/api/images").json() == []
+    mock_podman.api.get.assert_called_once()
 
-    mock_images = [mock_image1, mock_image2]
+    # Pulling an image invalidates the cached list
+    client.post("/api/images/pull", json={"image_name": "nginx:latest"})
+    client.get("/api/images")
+    assert mock_podman.api.get.call_count == 2
 
-    # Expected response - a list of image names
-    expected_response = [attrs1, attrs2]
-    # Create a mock for the Podman client
-    mock_client = MagicMock()
-    mock_client.images.list.return_value = mock_images
+    # So does deleting one
+    client.delete("/api/images?image_name=nginx:latest")
+    client.get("/api/images")
+    assert mock_podman.api.get.call_count == 3
 
-    # Override the dependency to use our mock
-    app.dependency_overrides[get_podman_client] = lambda: mock_client
 
-    try:
-        # Make the request to the endpoint
-        response = client.get("/api/images")
+def test_get_images_gzipped(client: TestClient, mock_podman: MagicMock) -> None:
+    images = [{"Id": str(i), "RepoTags": [f"example:{i}"]} for i in range(100)]
+    mock_podman.api.get.return_value.content = orjson.dumps(images)
 
-        # Verify the response
-        assert response.status_code == 200
-        assert response.json() == expected_response
-
-        # Verify that the mock was called correctly
-        mock_client.images.list.assert_called_once()
-    finally:
-        # Clean up the dependency override
-        app.dependency_overrides.pop(get_podman_client)
+    # Large lists are compressed when the client accepts gzip
+    response = client.get("/api/images", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+    assert response.json() == images
 
 
 class TestPullImage:
-    def test_success(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.pull.return_value = {
+    def test_success(self, client: TestClient, mock_podman: MagicMock) -> None:
+        mock_podman.images.pull.return_value = {
             "Id": "image1",
             "Names": ["nginx:latest"],
         }
 
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-        try:
-            # Make the request to the endpoint
-            response = client.post(
-                "/api/images/pull",
-                json={
-                    "image_name": "nginx:latest",
-                },
-            )
-
-            # Verify the response
-            assert response.status_code == 204
-            assert response.content == b""  # Empty response body
-
-            # Verify that the mock methods were called correctly
-            mock_client.images.pull.assert_called_with("nginx:latest")
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
-
-    def test_not_found(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.pull.side_effect = ImageNotFound("Image not found")
-
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-        try:
-            # Make the request to the endpoint
-            response = client.post(
-                "/api/images/pull",
-                json={
-                    "image_name": "nonexistent:latest",
-                },
-            )
-
-            # Verify the response
-            assert response.status_code == 404
-            assert "not found" in response.json()["detail"]
-
-            # Verify that the mock methods were called correctly
-            mock_client.images.pull.assert_called_with("nonexistent:latest")
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
-
-    def test_api_error(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.pull.side_effect = APIError("API Error")
-
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-        try:
-            # Make the request to the endpoint
-            response = client.post(
-                "/api/images/pull",
-                json={
-                    "image_name": "nginx:latest",
-                },
-            )
-
-            # Verify the response
-            assert response.status_code == 500
-            assert "Error pulling image" in response.json()["detail"]
-
-            # Verify that the mock methods were called correctly
-            mock_client.images.pull.assert_called_with("nginx:latest")
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
-
-    def test_with_custom_registry(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.pull.return_value = {
-            "Id": "image1",
-            "Names": ["registry.example.com/myapp:latest"],
-        }
+        # Make the request to the endpoint
+        response = client.post(
+            "/api/images/pull",
+            json={
+                "image_name": "nginx:latest",
+            },
+        )
 
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
+        # Verify the response
+        assert response.status_code == 204
+        assert response.content == b""  # Empty response body
 
-        try:
-            # Make the request to the endpoint
-            response = client.post(
-                "/api/images/pull",
-                json={
-                    "image_name": "registry.example.com/myapp:latest",
-                },
-            )
+        # Verify that the mock methods were called correctly
+        mock_podman.images.pull.assert_called_with("nginx:latest")
 
-            # Verify the response
-            assert response.status_code == 204
-            assert response.content == b""  # Empty response body
+    @pytest.mark.parametrize(
+        ("error", "status_code", "detail"),
+        [
+            (ImageNotFound("Image not found"), 404, "Image nginx:latest not found"),
+            (APIError("API Error"), 500, "Error pulling image"),
+        ],
+    )
+    def test_error(
+        self,
+        client: TestClient,
+        mock_podman: MagicMock,
+        error: Exception,
+        status_code: int,
+        detail: str,
+    ) -> None:
+        mock_podman.images.pull.side_effect = error
 
-            # Verify that the mock methods were called correctly
-            mock_client.images.pull.assert_called_with(
-                "registry.example.com/myapp:latest"
-            )
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
+        # Make the request to the endpoint
+        response = client.post("/api/images/pull", json={"image_name": "nginx:latest"})
 
+        # Verify the response
+        assert response.status_code == status_code
+        assert response.json()["detail"] == detail
 
-class TestDeleteImage:
-    def test_no_args(self) -> None:
-        mock_client = MagicMock()
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
-        try:
-            response = client.delete("/api/images")
-            assert response.status_code == 400
-            assert (
-                "Either image_id or image_name must be provided"
-                == response.json()["detail"]
-            )
-        finally:
-            app.dependency_overrides.pop(get_podman_client)
-
-    def test_args_conflict(self) -> None:
-        mock_client = MagicMock()
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
-        try:
-            response = client.delete("/api/images?image_id=123&image_name=456")
-            assert response.status_code == 400
-            assert (
-                "Either image_id or image_name must be provided, not both"
-                == response.json()["detail"]
-            )
-        finally:
-            app.dependency_overrides.pop(get_podman_client)
-
-    def test_by_name_success(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.remove.return_value = [
-            {
-                "Deleted": "sha256:a1801b843b1bfaf77c501e7a6d3f709401a1e0c83863037fa3aab063a7fdb9dc"
-            },
-            {"Untagged": "nginx:latest"},
-            {"ExitCode": 0},
-        ]
+        # Verify that the mock methods were called correctly
+        mock_podman.images.pull.assert_called_with("nginx:latest")
 
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
+    def test_with_custom_registry(
+        self, client: TestClient, mock_podman: MagicMock
+    ) -> None:
+        mock_podman.images.pull.return_value = {
+            "Id": "image1",
+            "Names": ["registry.example.com/myapp:latest"],
+        }
 
-        # Image name to delete
-        image_name = "nginx:latest"
+        # Make the request to the endpoint
+        response = client.post(
+            "/api/images/pull",
+            json={
+                "image_name": "registry.example.com/myapp:latest",
+            },
+        )
 
-        try:
-            # Make the request to the endpoint
-            response = client.delete(f"/api/images/?image_name={image_name}")
+        # Verify the response
+        assert response.status_code == 204
+        assert response.content == b""  # Empty response body
 
-            # Verify the response - should be 204 No Content with no body
-            assert response.status_code == 204
-            assert response.content == b""  # Empty response body
+        # Verify that the mock methods were called correctly
+        mock_podman.images.pull.assert_called_with("registry.example.com/myapp:latest")
 
-            # Verify that the mock was called correctly
-            mock_client.images.remove.assert_called_with(image=image_name, force=False)
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
+    def test_stream_progress(self, client: TestClient, mock_podman: MagicMock) -> None:
+        mock_podman.images.pull.return_value = iter(
+            [{"status": "Pulling fs layer"}, {"id": "image1"}]
+        )
 
-    def test_by_id_success(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.remove.return_value = [
-            {
-                "Deleted": "sha256:a1801b843b1bfaf77c501e7a6d3f709401a1e0c83863037fa3aab063a7fdb9dc"
+        # Make the request to the endpoint asking for NDJSON progress
+        response = client.post(
+            "/api/images/pull",
+            json={
+                "image_name": "nginx:latest",
             },
-            {"Untagged": "nginx:latest"},
-            {"ExitCode": 0},
-        ]
-
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-        # Image name to delete
-        image_id = (
-            "sha256:a1801b843b1bfaf77c501e7a6d3f709401a1e0c83863037fa3aab063a7fdb9dc"
+            headers={"Accept": "application/x-ndjson"},
         )
 
-        try:
-            # Make the request to the endpoint
-            response = client.delete(f"/api/images/?image_id={image_id}")
-
-            # Verify the response - should be 204 No Content with no body
-            assert response.status_code == 204
-            assert response.content == b""  # Empty response body
-
-            # Verify that the mock was called correctly
-            mock_client.images.remove.assert_called_with(image=image_id, force=False)
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
-
-    def test_by_name_force(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.remove.return_value = [
-            {
-                "Deleted": "sha256:a1801b843b1bfaf77c501e7a6d3f709401a1e0c83863037fa3aab063a7fdb9dc"
-            },
-            {"Untagged": "nginx:latest"},
-            {"ExitCode": 0},
+        # Verify the response
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.text.splitlines() == [
+            '{"status":"Pulling fs layer"}',
+            '{"id":"image1"}',
         ]
 
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-        # Image name to delete
-        image_name = "nginx:latest"
-
-        try:
-            # Make the request to the endpoint with force=true
-            response = client.delete(f"/api/images/?image_name={image_name}&force=true")
-
-            # Verify the response - should be 204 No Content with no body
-            assert response.status_code == 204
-            assert response.content == b""  # Empty response body
+        # Verify that the mock methods were called correctly
+        mock_podman.images.pull.assert_called_with(
+            "nginx:latest", stream=True, decode=True
+        )
 
-            # Verify that the mock was called correctly with force=True
-            mock_client.images.remove.assert_called_with(image=image_name, force=True)
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
+    def test_stream_error(
+        self,
+        client: TestClient,
+        mock_podman: MagicMock,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        mock_podman.images.pull.return_value = iter(
+            [{"status": "Pulling fs layer"}, {"error": "unauthorized"}]
+        )
+        images_router._images_cache["images"] = b"[]"
 
-    def test_by_id_force(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.remove.return_value = [
-            {
-                "Deleted": "sha256:a1801b843b1bfaf77c501e7a6d3f709401a1e0c83863037fa3aab063a7fdb9dc"
+        # Make the request to the endpoint asking for NDJSON progress
+        response = client.post(
+            "/api/images/pull",
+            json={
+                "image_name": "private:latest",
             },
-            {"Untagged": "nginx:latest"},
-            {"ExitCode": 0},
-        ]
-
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-        # Image name to delete
-        image_id = (
-            "sha256:a1801b843b1bfaf77c501e7a6d3f709401a1e0c83863037fa3aab063a7fdb9dc"
+            headers={"Accept": "application/x-ndjson"},
         )
 
-        try:
-            # Make the request to the endpoint with force=true
-            response = client.delete(f"/api/images/?image_id={image_id}&force=true")
-
-            # Verify the response - should be 204 No Content with no body
-            assert response.status_code == 204
-            assert response.content == b""  # Empty response body
-
-            # Verify that the mock was called correctly with force=True
-            mock_client.images.remove.assert_called_with(image=image_id, force=True)
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
-
-    def test_by_name_not_found(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.remove.side_effect = ImageNotFound("Image not found")
-
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-        # Nonexistent image name
-        image_name = "nonexistent:latest"
-
-        try:
-            # Make the request to the endpoint
-            response = client.delete(f"/api/images?image_name={image_name}")
-
-            # Verify the response
-            assert response.status_code == 404
-            assert "not found" in response.json()["detail"]
-
-            # Verify that the mock was called correctly
-            mock_client.images.remove.assert_called_with(image=image_name, force=False)
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
+        # The error line reaches the client, but the pull is not a success
+        assert response.status_code == 200
+        assert response.text.splitlines()[-1] == '{"error":"unauthorized"}'
+        assert "images" in images_router._images_cache
+        assert "Error while pulling image private:latest" in caplog.text
+        assert "pulled successfully" not in caplog.text
+
+    def test_stream_not_found(self, client: TestClient, mock_podman: MagicMock) -> None:
+        mock_podman.images.pull.side_effect = ImageNotFound("Image not found")
+
+        # Errors before the first chunk still map to a status code
+        response = client.post(
+            "/api/images/pull",
+            json={
+                "image_name": "nonexistent:latest",
+            },
+            headers={"Accept": "application/x-ndjson"},
+        )
 
-    def test_by_id_not_found(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.remove.side_effect = ImageNotFound("Image not found")
+        # Verify the response
+        assert response.status_code == 404
+
+
+# Run a delete_image test once with an image name and once with an image id
+by_name_or_id = pytest.mark.parametrize(
+    ("param", "identifier"),
+    [
+        ("image_name", "nginx:latest"),
+        (
+            "image_id",
+            "sha256:a1801b843b1bfaf77c501e7a6d3f709401a1e0c83863037fa3aab063a7fdb9dc",
+        ),
+    ],
+    ids=["by_name", "by_id"],
+)
+
+# What podman reports for a successful image removal
+DELETE_RESULT = [
+    {
+        "Deleted": "sha256:a1801b843b1bfaf77c501e7a6d3f709401a1e0c83863037fa3aab063a7fdb9dc"
+    },
+    {"Untagged": "nginx:latest"},
+    {"ExitCode": 0},
+]
 
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
 
-        # Nonexistent image name
-        image_id = (
-            "sha256:a1831b843b1bfaf77c521e7a6d3f709401a1e0c83863034fa3aab063a7fdb9ef"
+class TestDeleteImage:
+    def test_no_args(self, client: TestClient, mock_podman: MagicMock) -> None:
+        response = client.delete("/api/images")
+        assert response.status_code == 400
+        assert (
+            "Either image_id or image_name must be provided"
+            == response.json()["detail"]
         )
 
-        try:
-            # Make the request to the endpoint
-            response = client.delete(f"/api/images?image_id={image_id}")
+    def test_args_conflict(self, client: TestClient, mock_podman: MagicMock) -> None:
+        response = client.delete("/api/images?image_id=123&image_name=456")
+        assert response.status_code == 400
+        assert (
+            "Either image_id or image_name must be provided, not both"
+            == response.json()["detail"]
+        )
 
-            # Verify the response
-            assert response.status_code == 404
-            assert "not found" in response.json()["detail"]
+    @by_name_or_id
+    @pytest.mark.parametrize("force", [False, True])
+    def test_success(
+        self,
+        client: TestClient,
+        mock_podman: MagicMock,
+        param: str,
+        identifier: str,
+        force: bool,
+    ) -> None:
+        mock_podman.images.remove.return_value = DELETE_RESULT
 
-            # Verify that the mock was called correctly
-            mock_client.images.remove.assert_called_with(image=image_id, force=False)
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
+        # Make the request to the endpoint
+        query = f"{param}={identifier}" + ("&force=true" if force else "")
+        response = client.delete(f"/api/images/?{query}")
 
-    def test_by_name_in_use(self) -> None:
-        mock_client = MagicMock()
-        response_ = Response()
-        response_.status_code = 409
-        explanation = "image used by d384ed93e53fdfb5a41f4b72a21fcfae5526914512950eb76307d9f16418e00e: image is in use by a container: consider listing external containers and force-removing image"
-        error = APIError(
-            "image is in use by a container",
-            response=response_,
-            explanation=explanation,
-        )
-        mock_client.images.remove.side_effect = error
+        # Verify the response - should be 204 No Content with no body
+        assert response.status_code == 204
+        assert response.content == b""  # Empty response body
 
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
+        # Verify that the mock was called correctly
+        mock_podman.images.remove.assert_called_with(image=identifier, force=force)
 
-        image_name = "nginx:latest"
+    @by_name_or_id
+    def test_not_found(
+        self, client: TestClient, mock_podman: MagicMock, param: str, identifier: str
+    ) -> None:
+        mock_podman.images.remove.side_effect = ImageNotFound("Image not found")
 
-        try:
-            # Make the request to the endpoint
-            response = client.delete(f"/api/images?image_name={image_name}")
+        # Make the request to the endpoint
+        response = client.delete(f"/api/images?{param}={identifier}")
 
-            # Verify the response
-            assert response.status_code == 409
-            assert "image used by" in response.json()["detail"]
+        # Verify the response
+        assert response.status_code == 404
+        assert "not found" in response.json()["detail"]
 
-            # Verify that the mock was called correctly
-            mock_client.images.remove.assert_called_with(image=image_name, force=False)
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
+        # Verify that the mock was called correctly
+        mock_podman.images.remove.assert_called_with(image=identifier, force=False)
 
-    def test_by_id_in_use(self) -> None:
-        mock_client = MagicMock()
+    @by_name_or_id
+    def test_in_use(
+        self, client: TestClient, mock_podman: MagicMock, param: str, identifier: str
+    ) -> None:
         response_ = Response()
         response_.status_code = 409
         explanation = "image used by d384ed93e53fdfb5a41f4b72a21fcfae5526914512950eb76307d9f16418e00e: image is in use by a container: consider listing external containers and force-removing image"
@@ -462,76 +393,34 @@ class TestDeleteImage:
             response=response_,
             explanation=explanation,
         )
-        mock_client.images.remove.side_effect = error
-
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
-
-        image_id = (
-            "sha256:a1801b843b1bfaf77c501e7a6d3f709401a1e0c83863037fa3aab063a7fdb9dc"
-        )
-
-        try:
-            # Make the request to the endpoint
-            response = client.delete(f"/api/images?image_id={image_id}")
-
-            # Verify the response
-            assert response.status_code == 409
-            assert "image used by" in response.json()["detail"]
-
-            # Verify that the mock was called correctly
-            mock_client.images.remove.assert_called_with(image=image_id, force=False)
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
-
-    def test_by_name_api_error(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.remove.side_effect = Exception("Something went wrong")
-
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
+        mock_podman.images.remove.side_effect = error
 
-        # Image name that will cause an API error
-        image_name = "nginx:latest"
-
-        try:
-            # Make the request to the endpoint
-            response = client.delete(f"/api/images?image_name={image_name}")
-
-            # Verify the response
-            assert response.status_code == 500
-            assert response.json()["detail"] == "Unexpected error"
-
-            # Verify that the mock was called correctly
-            mock_client.images.remove.assert_called_with(image=image_name, force=False)
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
-
-    def test_by_id_api_error(self) -> None:
-        # Create a mock for the Podman client
-        mock_client = MagicMock()
-        mock_client.images.remove.side_effect = Exception("Something went wrong")
+        # Make the request to the endpoint
+        response = client.delete(f"/api/images?{param}={identifier}")
 
-        # Override the dependency to use our mock
-        app.dependency_overrides[get_podman_client] = lambda: mock_client
+        # Verify the response
+        assert response.status_code == 409
+        assert "image used by" in response.json()["detail"]
 
-        # Image name that will cause an API error
-        image_id = (
-            "sha256:a1801b843b1bfaf77c501e7a6d3f709401a1e0c83863037fa3aab063a7fdb9dc"
-        )
+        # Verify that the mock was called correctly
+        mock_podman.images.remove.assert_called_with(image=identifier, force=False)
+
+    @by_name_or_id
+    def test_unexpected_error(
+        self,
+        server_error_client: TestClient,
+        mock_podman: MagicMock,
+        param: str,
+        identifier: str,
+    ) -> None:
+        mock_podman.images.remove.side_effect = Exception("Something went wrong")
 
-        try:
-            # Make the request to the endpoint
-            response = client.delete(f"/api/images?image_id={image_id}")
+        # Make the request to the endpoint
+        response = server_error_client.delete(f"/api/images?{param}={identifier}")
 
-            # Verify the response
-            assert response.status_code == 500
-            assert response.json()["detail"] == "Unexpected error"
+        # Verify the response
+        assert response.status_code == 500
+        assert response.json()["detail"] == "Unexpected error"
 
-            # Verify that the mock was called correctly
-            mock_client.images.remove.assert_called_with(image=image_id, force=False)
-        finally:
-            # Clean up the dependency override
-            app.dependency_overrides.pop(get_podman_client)
+        # Verify that the mock was called correctly
+        mock_podman.images.remove.assert_called_with(image=identifier, force=False)
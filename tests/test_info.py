@@ -1,13 +1,24 @@
+from typing import Iterator
 from unittest.mock import MagicMock
 
+import pytest
 from fastapi.testclient import TestClient
+from podman.errors import APIError
 
 from app.dependencies import get_podman_client
 from app.main import app
+from app.routers import info as info_router
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def clear_info_cache() -> Iterator[None]:
+    info_router._info_cache.clear()
+    yield
+    info_router._info_cache.clear()
+
+
 def test_info() -> None:
     info = {
         "host": {
@@ -161,3 +172,45 @@ libseccomp: 2.5.0""",
         mock_client.info.assert_called_once()
     finally:
         app.dependency_overrides.pop(get_podman_client)
+
+
+def test_info_api_error() -> None:
+    # Create a mock for the Podman client
+    mock_client = MagicMock()
+    mock_client.info.side_effect = APIError("API Error")
+
+    # Override the dependency to use our mock
+    app.dependency_overrides[get_podman_client] = lambda: mock_client
+
+    try:
+        # Unmapped podman errors are still answered with a JSON 500
+        response = client.get("/api/info")
+
+        # Verify the response
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Podman API error"}
+    finally:
+        # Clean up the dependency override
+        app.dependency_overrides.pop(get_podman_client)
+
+
+def test_info_cached() -> None:
+    # Create a mock for the Podman client
+    mock_client = MagicMock()
+    mock_client.info.return_value = {"host": {"hostname": "example.local"}}
+
+    # Override the dependency to use our mock
+    app.dependency_overrides[get_podman_client] = lambda: mock_client
+
+    try:
+        # Repeated requests within the TTL only ask podman once
+        first = client.get("/api/info")
+        second = client.get("/api/info")
+
+        # Verify the response
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json() == {"host": {"hostname": "example.local"}}
+        mock_client.info.assert_called_once()
+    finally:
+        # Clean up the dependency override
+        app.dependency_overrides.pop(get_podman_client)
@@ -0,0 +1,52 @@
+import io
+import logging
+import sys
+
+import orjson
+
+from app.log import JSONFormatter, QueueStreamHandler
+
+
+def test_queue_stream_handler_writes_formatted_records() -> None:
+    stream = io.StringIO()
+    handler = QueueStreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+
+    logger = logging.getLogger("tests.log")
+    logger.addHandler(handler)
+    try:
+        logger.warning("Pulled %s", "nginx:latest")
+    finally:
+        logger.removeHandler(handler)
+        # Closing stops the listener after it has drained the queue
+        handler.close()
+
+    assert stream.getvalue() == "WARNING tests.log: Pulled nginx:latest\n"
+
+
+def test_json_formatter() -> None:
+    record = logging.LogRecord(
+        "app.routers.images", logging.INFO, __file__, 1, "Pulled %s", ("nginx",), None
+    )
+
+    assert orjson.loads(JSONFormatter().format(record)) == {
+        "ts": record.created,
+        "level": "INFO",
+        "name": "app.routers.images",
+        "message": "Pulled nginx",
+    }
+
+
+def test_json_formatter_includes_exception() -> None:
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        exc_info = sys.exc_info()
+    record = logging.LogRecord(
+        "app", logging.ERROR, __file__, 1, "Failed", None, exc_info
+    )
+
+    payload = orjson.loads(JSONFormatter().format(record))
+
+    assert payload["message"] == "Failed"
+    assert "ValueError: boom" in payload["exc_info"]
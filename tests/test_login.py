@@ -30,9 +30,10 @@ def test_login_repository_success() -> None:
 
         # Verify the response
         assert response.status_code == 200
-        assert response.json()["status"] == "success"
-        assert "Successfully logged in to docker.io" in response.json()["message"]
-        assert response.json()["details"] == {"Status": "Login Succeeded"}
+        body = response.json()
+        assert body["status"] == "success"
+        assert "Successfully logged in to docker.io" in body["message"]
+        assert body["details"] == {"Status": "Login Succeeded"}
 
         # Verify that the mock methods were called correctly
         mock_client.login.assert_called_with(
@@ -63,8 +64,9 @@ def test_login_repository_default_registry() -> None:
 
         # Verify the response
         assert response.status_code == 200
-        assert response.json()["status"] == "success"
-        assert "Successfully logged in to docker.io" in response.json()["message"]
+        body = response.json()
+        assert body["status"] == "success"
+        assert "Successfully logged in to docker.io" in body["message"]
 
         # Verify that the mock methods were called correctly with default registry
         mock_client.login.assert_called_with(
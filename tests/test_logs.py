@@ -7,6 +7,8 @@ from app.dependencies import get_podman_client
 from app.main import app
 
 client = TestClient(app)
+# Unhandled exceptions reach the app's 500 handler instead of the test
+server_error_client = TestClient(app, raise_server_exceptions=False)
 
 
 def override_client(container_mock):
@@ -85,7 +87,7 @@ def test_get_logs_unexpected_exception():
     mock_client.containers.get.side_effect = Exception("unexpected")
     app.dependency_overrides[get_podman_client] = lambda: mock_client
     try:
-        response = client.get("/api/logs/fail")
+        response = server_error_client.get("/api/logs/fail")
         assert response.status_code == 500
         assert response.json()["detail"] == "Unexpected error"
     finally:
@@ -162,8 +164,20 @@ def test_stream_logs_unexpected_exception():
     mock_client.containers.get.side_effect = Exception("unexpected")
     app.dependency_overrides[get_podman_client] = lambda: mock_client
     try:
-        response = client.get("/api/logs/fail/stream")
+        response = server_error_client.get("/api/logs/fail/stream")
         assert response.status_code == 500
         assert response.json()["detail"] == "Unexpected error"
     finally:
         clear_override()
+
+
+def test_get_logs_json_invalid_utf8():
+    container = MagicMock()
+    container.logs.return_value = b"log 1\n\xff\xfe\nlog 2\n"
+    override_client(container)
+    try:
+        response = client.get("/api/logs/abc123")
+        assert response.status_code == 200
+        assert response.json() == ["log 1", "��", "log 2"]
+    finally:
+        clear_override()
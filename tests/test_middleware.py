@@ -0,0 +1,60 @@
+from collections.abc import Iterator
+
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware import StreamSafeGZipMiddleware
+
+BODY = b"x" * 2048
+
+app = FastAPI()
+app.add_middleware(StreamSafeGZipMiddleware, minimum_size=1024)
+
+
+@app.get("/whole")
+async def whole() -> Response:
+    return Response(BODY, media_type="text/plain")
+
+
+@app.get("/small")
+async def small() -> Response:
+    return Response(b"x", media_type="text/plain")
+
+
+@app.get("/stream")
+async def stream() -> StreamingResponse:
+    def chunks() -> Iterator[bytes]:
+        yield BODY
+        yield BODY
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+client = TestClient(app)
+
+
+def test_whole_response_is_gzipped() -> None:
+    response = client.get("/whole", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == BODY
+
+
+def test_small_response_is_not_gzipped() -> None:
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.content == b"x"
+
+
+def test_gzip_needs_accept_encoding() -> None:
+    response = client.get("/whole", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == BODY
+
+
+def test_stream_is_passed_through() -> None:
+    # Compressing would hold chunks back until gzip's buffer fills
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.content == BODY * 2